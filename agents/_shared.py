@@ -0,0 +1,40 @@
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Any
+
+from tools._shared import get_vector_db
+
+logger = logging.getLogger(__name__)
+
+# Warm-up requests give up quickly, as queries wait for them
+_WARM_TIMEOUT_SECONDS = 5
+
+def warm_connection(llm: Any) -> None:
+    """Open the chat model's HTTPS connection with a model listing, which unlike a completion is not billed."""
+    # ChatOpenAI holds the chat completions resource of an OpenAI client; other providers have no free
+    # endpoint to call, so they connect on the first query
+    api_client = getattr(getattr(llm, "client", None), "_client", None)
+    if hasattr(api_client, "models"):
+        api_client.models.list(timeout=_WARM_TIMEOUT_SECONDS)
+
+async def awarm_connection(llm: Any) -> None:
+    """Open the async client's HTTPS connection, which the async agent paths use instead of the sync one."""
+    api_client = getattr(getattr(llm, "async_client", None), "_client", None)
+    if hasattr(api_client, "models"):
+        await api_client.models.list(timeout=_WARM_TIMEOUT_SECONDS)
+
+def start_prewarm(llm: Any) -> Future:
+    """Open the LLM connection and load the vector DB on a background thread."""
+    future = Future()
+
+    def warm() -> None:
+        try:
+            warm_connection(llm)
+            get_vector_db()
+        except Exception as e:
+            logger.warning(f"Prewarm failed: {str(e)}")
+        future.set_result(None)
+
+    threading.Thread(target=warm, daemon=True).start()
+    return future
@@ -0,0 +1,187 @@
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from typing import List, Dict, Any, Optional, Tuple
+
+from langchain.agents import AgentExecutor, create_openai_tools_agent
+from langchain.prompts import ChatPromptTemplate
+from langchain.tools import BaseTool
+
+from config.settings import LLM_PROVIDER, ANTHROPIC_MODEL, OPENAI_MODEL, MEMORY_MAX_TOKENS
+from tools._shared import get_llm, get_vector_db
+from agents._shared import start_prewarm, awarm_connection
+from agents.memory import RollingTokenBufferMemory
+from agents.parallel_executor import ParallelToolExecutor, serialize_observation
+from utils.message_formatter import MessageFormatter, Role
+
+logger = logging.getLogger(__name__)
+
+class BaseAgent(ABC):
+    """Runs a tool-calling agent; subclasses set the prompt, tools and tuning below."""
+    # Prompt used to build the agent
+    _PROMPT_TEMPLATE: ChatPromptTemplate
+    _TEMPERATURE = 0.5
+    _HANDLE_PARSING_ERRORS = True
+    # Independent batch queries run at the same time
+    _BATCH_CONCURRENCY = 4
+    # Queries whose outcome is deterministic, answered by calling the tool directly instead of the LLM
+    _FAST_PATHS: Dict[str, Any] = {}
+
+    def __init__(self):
+        self.tools = self._setup_tools()
+        self.llm = self._setup_llm()
+        # Only the most recent turns are resent, keeping prompt size bounded in long sessions
+        self.memory = RollingTokenBufferMemory(
+            llm=self.llm,
+            memory_key="chat_history",
+            return_messages=True,
+            # Streamed results also carry "messages", so name the key to store
+            output_key="output",
+            max_token_limit=MEMORY_MAX_TOKENS
+        )
+        self.agent_executor = self._setup_agent(memory=self.memory)
+        # Memory is not safe to share between concurrent runs, so batches use a stateless executor
+        self.batch_executor = self._setup_agent(memory=None)
+        self._prewarm = None
+
+    def prewarm(self) -> None:
+        """Warm up the LLM connection and vector database in the background."""
+        if self._prewarm is None:
+            self._prewarm = start_prewarm(self.llm)
+
+    async def aprewarm(self) -> None:
+        """Open the async LLM connection, e.g. while the user is typing the next query."""
+        try:
+            await awarm_connection(self.llm)
+        except Exception as e:
+            # Runs before every interactive query, so a failure is not worth a warning each time
+            logger.debug(f"Prewarm failed: {str(e)}")
+
+    @property
+    def vector_db(self) -> Any:
+        """Shared vector database, created on first use."""
+        return get_vector_db()
+
+    @abstractmethod
+    def _setup_tools(self) -> List[Any]:
+        """Set up the tools for the agent."""
+
+    def _setup_llm(self) -> Any:
+        """Set up the language model based on configuration."""
+        model = ANTHROPIC_MODEL if LLM_PROVIDER.lower() == "anthropic" else OPENAI_MODEL
+        return get_llm(LLM_PROVIDER.lower(), model, self._TEMPERATURE)
+
+    def _setup_agent(self, memory: Optional[RollingTokenBufferMemory] = None) -> AgentExecutor:
+        """Set up the agent with tools and LLM."""
+        # Create agent
+        agent = create_openai_tools_agent(self.llm, self.tools, self._PROMPT_TEMPLATE)
+
+        # Create agent executor, running read-only tool calls of a step in parallel
+        return ParallelToolExecutor(
+            agent=agent,
+            tools=self.tools,
+            memory=memory,
+            verbose=True,
+            handle_parsing_errors=self._HANDLE_PARSING_ERRORS
+        )
+
+    def _match_fast_path(self, query: str) -> Optional[Tuple[BaseTool, Dict[str, Any]]]:
+        """The tool and arguments answering a known deterministic query, or None."""
+        fast_path = self._FAST_PATHS.get(query.strip().lower())
+        if fast_path is None:
+            return None
+
+        tool_name, tool_args = fast_path
+        logger.info(f"Answering query directly with {tool_name}")
+        return next(tool for tool in self.tools if tool.name == tool_name), tool_args
+
+    def _finish_fast_path(self, query: str, observation: Any,
+                          memory: Optional[RollingTokenBufferMemory]) -> Dict[str, Any]:
+        """Record and print a tool result that answered the query directly."""
+        output = serialize_observation(observation, indent=True)
+
+        # Keep the chat history coherent for follow-up questions
+        if memory is not None:
+            memory.save_context({"input": query}, {"output": output})
+
+        # Print the response message
+        MessageFormatter.print_message(Role.ASSISTANT, output)
+
+        return {"input": query, "output": output}
+
+    @staticmethod
+    def _handle_chunk(chunk: Dict[str, Any], result: Dict[str, Any]) -> Dict[str, Any]:
+        """Print the tool calls of a streamed chunk and return the final result once it arrives."""
+        # Show tool calls as soon as they are planned instead of after the final answer
+        for action in chunk.get("actions", []):
+            MessageFormatter.print_message(Role.FUNCTION, f"Calling {action.tool} with {action.tool_input}")
+        return chunk if "output" in chunk else result
+
+    def run(self, query: str) -> Dict[str, Any]:
+        """Run the agent with a query."""
+        logger.info(f"Running agent with query: {query}")
+
+        # Print the query message
+        MessageFormatter.print_message(Role.USER, query)
+
+        fast_path = self._match_fast_path(query)
+        if fast_path is not None:
+            tool, tool_args = fast_path
+            return self._finish_fast_path(query, tool._run(**tool_args), self.memory)
+
+        # Run the agent once any prewarm has finished, so the connection is not opened twice
+        if self._prewarm is not None:
+            self._prewarm.result()
+        result = {}
+        for chunk in self.agent_executor.stream({"input": query}):
+            result = self._handle_chunk(chunk, result)
+
+        # Print the response message
+        MessageFormatter.print_message(Role.ASSISTANT, result["output"])
+
+        return result
+
+    async def arun(self, query: str, executor: Optional[AgentExecutor] = None) -> Dict[str, Any]:
+        """Run the agent with a query without blocking the event loop."""
+        logger.info(f"Running agent asynchronously with query: {query}")
+        executor = executor or self.agent_executor
+
+        # Print the query message
+        MessageFormatter.print_message(Role.USER, query)
+
+        fast_path = self._match_fast_path(query)
+        if fast_path is not None:
+            tool, tool_args = fast_path
+            # Tools read files and search the vector DB synchronously, so keep them off the event loop
+            observation = await asyncio.to_thread(tool._run, **tool_args)
+            return self._finish_fast_path(query, observation, executor.memory)
+
+        # Run the agent once any prewarm has finished, so the connection is not opened twice
+        if self._prewarm is not None:
+            await asyncio.wrap_future(self._prewarm)
+        inputs = {"input": query}
+        if executor.memory is None:
+            inputs["chat_history"] = []
+        result = {}
+        async for chunk in executor.astream(inputs):
+            result = self._handle_chunk(chunk, result)
+
+        # Print the response message
+        MessageFormatter.print_message(Role.ASSISTANT, result["output"])
+
+        return result
+
+    async def arun_batch(self, queries: List[str]) -> List[Dict[str, Any]]:
+        """Run independent queries concurrently, at most _BATCH_CONCURRENCY at a time."""
+        # Bound the fan-out so large batches don't hit provider rate limits all at once
+        semaphore = asyncio.Semaphore(self._BATCH_CONCURRENCY)
+
+        async def run_one(query: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.arun(query, self.batch_executor)
+
+        return await asyncio.gather(*(run_one(query) for query in queries))
+
+    def run_batch(self, queries: List[str]) -> List[Dict[str, Any]]:
+        """Run independent queries concurrently and wait for all results."""
+        return asyncio.run(self.arun_batch(queries))
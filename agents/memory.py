@@ -0,0 +1,34 @@
+from typing import Any, Dict, List
+
+from langchain.memory import ConversationTokenBufferMemory
+from langchain.schema import HumanMessage, AIMessage
+from langchain_core.pydantic_v1 import Field
+
+class RollingTokenBufferMemory(ConversationTokenBufferMemory):
+    """Token-limited chat memory that counts each message once instead of re-counting the whole buffer."""
+
+    # Token count of each message in the buffer, oldest first
+    message_tokens: List[int] = Field(default_factory=list)
+    total_tokens: int = 0
+
+    def save_context(self, inputs: Dict[str, Any], outputs: Dict[str, str]) -> None:
+        """Append the exchange and drop the oldest messages once over the token limit."""
+        input_str, output_str = self._get_input_output(inputs, outputs)
+
+        for message in (HumanMessage(content=input_str), AIMessage(content=output_str)):
+            self.chat_memory.add_message(message)
+            tokens = self.llm.get_num_tokens_from_messages([message])
+            self.message_tokens.append(tokens)
+            self.total_tokens += tokens
+
+        # Prune from the front using the cached counts
+        buffer = self.chat_memory.messages
+        while self.total_tokens > self.max_token_limit and buffer:
+            buffer.pop(0)
+            self.total_tokens -= self.message_tokens.pop(0)
+
+    def clear(self) -> None:
+        """Clear memory contents."""
+        super().clear()
+        self.message_tokens = []
+        self.total_tokens = 0
@@ -0,0 +1,249 @@
+import asyncio
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from itertools import groupby
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple, Union
+
+from langchain.agents import AgentExecutor
+from langchain.agents.agent import ExceptionTool
+from langchain.agents.tools import InvalidTool
+from langchain.callbacks.manager import AsyncCallbackManagerForChainRun, CallbackManagerForChainRun
+from langchain.schema import AgentAction, AgentFinish, OutputParserException
+from langchain_core.agents import AgentStep
+from langchain.tools import BaseTool
+
+from config.settings import TOOL_CONCURRENCY_LIMIT
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+def serialize_observation(observation: Any, indent: bool = False) -> str:
+    """Encode a tool result as JSON once, instead of on every step the scratchpad is rebuilt."""
+    if isinstance(observation, str):
+        return observation
+    try:
+        if orjson is not None:
+            option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+            return orjson.dumps(observation, default=str, option=option).decode()
+        return json.dumps(observation, ensure_ascii=False, default=str, indent=2 if indent else None)
+    except (TypeError, ValueError):
+        return str(observation)
+
+class ParallelToolExecutor(AgentExecutor):
+    """AgentExecutor that runs concurrency-safe tool calls from the same step in parallel.
+
+    Consecutive actions whose tools set ``is_concurrency_safe`` run together, all
+    other actions run one at a time. Tools whose safety depends on the call, such as
+    read and write operations of one tool, define ``is_concurrency_safe_call(tool_input)``
+    instead. Observations keep the order the LLM requested.
+    """
+    max_concurrency: int = TOOL_CONCURRENCY_LIMIT
+
+    def _partition(self, name_to_tool_map: Dict[str, BaseTool],
+                   actions: List[AgentAction]) -> List[Tuple[bool, List[AgentAction]]]:
+        """Group consecutive actions by whether their tool is safe to run concurrently."""
+        def is_safe(action: AgentAction) -> bool:
+            tool = name_to_tool_map.get(action.tool)
+            is_safe_call = getattr(tool, "is_concurrency_safe_call", None)
+            if is_safe_call is not None:
+                return bool(is_safe_call(action.tool_input))
+            return bool(getattr(tool, "is_concurrency_safe", False))
+
+        return [(safe, list(group)) for safe, group in groupby(actions, key=is_safe)]
+
+    def _parsing_error_action(self, error: OutputParserException) -> AgentAction:
+        """Turn a parsing error of the plan into an action reporting it back, as the base executor does."""
+        if isinstance(self.handle_parsing_errors, bool) and not self.handle_parsing_errors:
+            raise ValueError(
+                "An output parsing error occurred. "
+                "In order to pass this error back to the agent and have it try "
+                "again, pass `handle_parsing_errors=True` to the AgentExecutor. "
+                f"This is the error: {str(error)}"
+            )
+        text = str(error)
+        if isinstance(self.handle_parsing_errors, bool):
+            if error.send_to_llm:
+                observation = str(error.observation)
+                text = str(error.llm_output)
+            else:
+                observation = "Invalid or incomplete response"
+        elif isinstance(self.handle_parsing_errors, str):
+            observation = self.handle_parsing_errors
+        elif callable(self.handle_parsing_errors):
+            observation = self.handle_parsing_errors(error)
+        else:
+            raise ValueError("Got unexpected type of `handle_parsing_errors`")
+        return AgentAction("_Exception", observation, text)
+
+    def _perform_action(self, name_to_tool_map: Dict[str, BaseTool], color_mapping: Dict[str, str],
+                        agent_action: AgentAction,
+                        run_manager: Optional[CallbackManagerForChainRun] = None) -> AgentStep:
+        """Run a single tool call and return its observation."""
+        if run_manager:
+            run_manager.on_agent_action(agent_action, color="green")
+
+        tool_run_kwargs = self.agent.tool_run_logging_kwargs()
+        callbacks = run_manager.get_child() if run_manager else None
+        if agent_action.tool in name_to_tool_map:
+            tool = name_to_tool_map[agent_action.tool]
+            if tool.return_direct:
+                tool_run_kwargs["llm_prefix"] = ""
+            observation = tool.run(
+                agent_action.tool_input,
+                verbose=self.verbose,
+                color=color_mapping[agent_action.tool],
+                callbacks=callbacks,
+                **tool_run_kwargs
+            )
+        else:
+            observation = InvalidTool().run(
+                {
+                    "requested_tool_name": agent_action.tool,
+                    "available_tool_names": list(name_to_tool_map.keys()),
+                },
+                verbose=self.verbose,
+                color=None,
+                callbacks=callbacks,
+                **tool_run_kwargs
+            )
+        return AgentStep(action=agent_action, observation=serialize_observation(observation))
+
+    async def _aperform_action(self, name_to_tool_map: Dict[str, BaseTool], color_mapping: Dict[str, str],
+                               agent_action: AgentAction,
+                               run_manager: Optional[AsyncCallbackManagerForChainRun] = None) -> AgentStep:
+        """Run a single tool call asynchronously and return its observation."""
+        if run_manager:
+            await run_manager.on_agent_action(agent_action, verbose=self.verbose, color="green")
+
+        tool_run_kwargs = self.agent.tool_run_logging_kwargs()
+        callbacks = run_manager.get_child() if run_manager else None
+        if agent_action.tool in name_to_tool_map:
+            tool = name_to_tool_map[agent_action.tool]
+            if tool.return_direct:
+                tool_run_kwargs["llm_prefix"] = ""
+            observation = await tool.arun(
+                agent_action.tool_input,
+                verbose=self.verbose,
+                color=color_mapping[agent_action.tool],
+                callbacks=callbacks,
+                **tool_run_kwargs
+            )
+        else:
+            observation = await InvalidTool().arun(
+                {
+                    "requested_tool_name": agent_action.tool,
+                    "available_tool_names": list(name_to_tool_map.keys()),
+                },
+                verbose=self.verbose,
+                color=None,
+                callbacks=callbacks,
+                **tool_run_kwargs
+            )
+        return AgentStep(action=agent_action, observation=serialize_observation(observation))
+
+    def _iter_next_step(
+        self,
+        name_to_tool_map: Dict[str, BaseTool],
+        color_mapping: Dict[str, str],
+        inputs: Dict[str, str],
+        intermediate_steps: List[Tuple[AgentAction, str]],
+        run_manager: Optional[CallbackManagerForChainRun] = None,
+    ) -> Iterator[Union[AgentFinish, AgentAction, AgentStep]]:
+        """Plan the next step and run its tool calls, in parallel where safe."""
+        try:
+            output = self.agent.plan(
+                self._prepare_intermediate_steps(intermediate_steps),
+                callbacks=run_manager.get_child() if run_manager else None,
+                **inputs
+            )
+        except OutputParserException as e:
+            # Handle the error of this plan instead of planning again
+            action = self._parsing_error_action(e)
+            if run_manager:
+                run_manager.on_agent_action(action, color="green")
+            observation = ExceptionTool().run(
+                action.tool_input,
+                verbose=self.verbose,
+                color=None,
+                callbacks=run_manager.get_child() if run_manager else None,
+                **self.agent.tool_run_logging_kwargs()
+            )
+            yield AgentStep(action=action, observation=observation)
+            return
+
+        if isinstance(output, AgentFinish):
+            yield output
+            return
+
+        actions = [output] if isinstance(output, AgentAction) else output
+        yield from actions
+
+        for safe, group in self._partition(name_to_tool_map, actions):
+            if safe and len(group) > 1:
+                logger.info(f"Running {len(group)} tool calls in parallel")
+                with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(group))) as pool:
+                    yield from pool.map(
+                        lambda action: self._perform_action(name_to_tool_map, color_mapping, action, run_manager),
+                        group
+                    )
+            else:
+                for action in group:
+                    yield self._perform_action(name_to_tool_map, color_mapping, action, run_manager)
+
+    async def _aiter_next_step(
+        self,
+        name_to_tool_map: Dict[str, BaseTool],
+        color_mapping: Dict[str, str],
+        inputs: Dict[str, str],
+        intermediate_steps: List[Tuple[AgentAction, str]],
+        run_manager: Optional[AsyncCallbackManagerForChainRun] = None,
+    ) -> AsyncIterator[Union[AgentFinish, AgentAction, AgentStep]]:
+        """Plan the next step and await its tool calls, gathering the safe ones."""
+        try:
+            output = await self.agent.aplan(
+                self._prepare_intermediate_steps(intermediate_steps),
+                callbacks=run_manager.get_child() if run_manager else None,
+                **inputs
+            )
+        except OutputParserException as e:
+            # Handle the error of this plan instead of planning again
+            action = self._parsing_error_action(e)
+            if run_manager:
+                await run_manager.on_agent_action(action, verbose=self.verbose, color="green")
+            observation = await ExceptionTool().arun(
+                action.tool_input,
+                verbose=self.verbose,
+                color=None,
+                callbacks=run_manager.get_child() if run_manager else None,
+                **self.agent.tool_run_logging_kwargs()
+            )
+            yield AgentStep(action=action, observation=observation)
+            return
+
+        if isinstance(output, AgentFinish):
+            yield output
+            return
+
+        actions = [output] if isinstance(output, AgentAction) else output
+        for action in actions:
+            yield action
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def perform(action: AgentAction) -> AgentStep:
+            async with semaphore:
+                return await self._aperform_action(name_to_tool_map, color_mapping, action, run_manager)
+
+        for safe, group in self._partition(name_to_tool_map, actions):
+            if safe:
+                steps = await asyncio.gather(*(perform(action) for action in group))
+            else:
+                steps = [await self._aperform_action(name_to_tool_map, color_mapping, action, run_manager)
+                         for action in group]
+            for step in steps:
+                yield step
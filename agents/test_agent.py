@@ -1,60 +1,19 @@
 import logging
 from typing import List, Dict, Any, Optional
 
-from langchain.agents import AgentExecutor, create_openai_functions_agent
 from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
-from langchain.memory import ConversationBufferMemory
 from langchain.schema import SystemMessage, HumanMessage
-from langchain_community.chat_models import ChatAnthropic
-from langchain_openai import ChatOpenAI
 
-from config.settings import LLM_PROVIDER, ANTHROPIC_API_KEY, OPENAI_API_KEY, ANTHROPIC_MODEL, OPENAI_MODEL
-from tools.code_analysis import CodeAnalysisTool
-from tools.test_generator import TestGeneratorTool
-from tools.compilation import CompilationTool
-from tools.vector_db import CodeVectorDB
+from config.settings import TEST_GENERATION_CONCURRENCY
+from tools._registry import get_tool
+from agents.base_agent import BaseAgent
+from agents.parallel_executor import serialize_observation
 from utils.message_formatter import MessageFormatter, Role
 
 logger = logging.getLogger(__name__)
 
-class TestAgent:
-    def __init__(self):
-        self.vector_db = CodeVectorDB()
-        self.tools = self._setup_tools()
-        self.llm = self._setup_llm()
-        self.memory = ConversationBufferMemory(
-            memory_key="chat_history",
-            return_messages=True
-        )
-        self.agent_executor = self._setup_agent()
-    
-    def _setup_tools(self) -> List[Any]:
-        """Set up the tools for the agent."""
-        return [
-            CodeAnalysisTool(),
-            TestGeneratorTool(),
-            CompilationTool()
-        ]
-    
-    def _setup_llm(self) -> Any:
-        """Set up the language model based on configuration."""
-        if LLM_PROVIDER.lower() == "anthropic":
-            return ChatAnthropic(
-                model=ANTHROPIC_MODEL,
-                anthropic_api_key=ANTHROPIC_API_KEY,
-                temperature=0.2
-            )
-        else:
-            return ChatOpenAI(
-                model=OPENAI_MODEL,
-                openai_api_key=OPENAI_API_KEY,
-                temperature=0.2
-            )
-    
-    def _setup_agent(self) -> AgentExecutor:
-        """Set up the agent with tools and LLM."""
-        # Create system prompt
-        system_prompt = """You are an expert test engineer specializing in creating comprehensive test suites for software projects.
+# System prompt and prompt template are static, so build them once at import time
+_SYSTEM_PROMPT = """You are an expert test engineer specializing in creating comprehensive test suites for software projects.
         Your task is to analyze code files, generate appropriate test cases, and validate the tests through execution.
         
         You have access to the following tools:
@@ -71,44 +30,32 @@ class TestAgent:
         
         Always explain your reasoning and the approach you're taking for testing.
         """
-        
-        # Create prompt template
-        prompt = ChatPromptTemplate.from_messages([
-            SystemMessage(content=system_prompt),
-            MessagesPlaceholder(variable_name="chat_history"),
-            HumanMessage(content="{input}"),
-            MessagesPlaceholder(variable_name="agent_scratchpad")
-        ])
-        
-        # Create agent
-        agent = create_openai_functions_agent(self.llm, self.tools, prompt)
-        
-        # Create agent executor
-        return AgentExecutor(
-            agent=agent,
-            tools=self.tools,
-            memory=self.memory,
-            verbose=True,
-            handle_parsing_errors=True
-        )
-    
-    def run(self, query: str) -> Dict[str, Any]:
-        """Run the agent with a query."""
-        logger.info(f"Running agent with query: {query}")
-        
-        # Format the query message
-        formatted_query = MessageFormatter.format_message(Role.USER, query)
-        print(formatted_query)
-        
-        # Run the agent
-        result = self.agent_executor.invoke({"input": query})
-        
-        # Format the response message
-        formatted_response = MessageFormatter.format_message(Role.ASSISTANT, result["output"])
-        print(formatted_response)
-        
-        return result
-    
+
+_PROMPT_TEMPLATE = ChatPromptTemplate.from_messages([
+    SystemMessage(content=_SYSTEM_PROMPT),
+    MessagesPlaceholder(variable_name="chat_history"),
+    HumanMessage(content="{input}"),
+    MessagesPlaceholder(variable_name="agent_scratchpad")
+])
+
+class TestAgent(BaseAgent):
+    _PROMPT_TEMPLATE = _PROMPT_TEMPLATE
+    _TEMPERATURE = 0.2
+    _HANDLE_PARSING_ERRORS = True
+    _BATCH_CONCURRENCY = TEST_GENERATION_CONCURRENCY
+    # Queries whose outcome is deterministic, answered by calling the tool directly instead of the LLM
+    _FAST_PATHS = {
+        "run all tests for the project": ("compilation", {"operation": "test"}),
+    }
+
+    def _setup_tools(self) -> List[Any]:
+        """Set up the tools for the agent."""
+        return [
+            get_tool("code_analysis"),
+            get_tool("test_generator"),
+            get_tool("compilation")
+        ]
+
     def generate_tests_for_file(self, file_path: str, test_framework: Optional[str] = None, 
                               output_path: Optional[str] = None) -> Dict[str, Any]:
         """Generate tests for a specific file."""
@@ -120,6 +67,25 @@ class TestAgent:
         
         return self.run(query)
     
+    async def agenerate_tests_for_files(self, file_paths: List[str],
+                                        test_framework: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Generate tests for several files with one batched LLM call, without blocking the event loop."""
+        # One prompt per file is already known, so the agent's planning round trips are skipped
+        results = await get_tool("test_generator").abatch_generate(file_paths, test_framework)
+        self._print_results(results)
+        return results
+    
+    def generate_tests_for_files(self, file_paths: List[str], test_framework: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Generate tests for several files with one batched LLM call."""
+        results = get_tool("test_generator").generate_for_files(file_paths, test_framework)
+        self._print_results(results)
+        return results
+    
+    def _print_results(self, results: List[Dict[str, Any]]) -> None:
+        """Print each file's test generation result."""
+        for result in results:
+            MessageFormatter.print_message(Role.ASSISTANT, serialize_observation(result, indent=True))
+    
     def run_tests(self, test_files: Optional[List[str]] = None) -> Dict[str, Any]:
         """Run tests for the project or specific test files."""
         if test_files:
@@ -1,66 +1,18 @@
+import asyncio
 import logging
 from typing import List, Dict, Any, Optional
 
-from langchain.agents import AgentExecutor, create_openai_functions_agent
 from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
-from langchain.schema.runnable import RunnablePassthrough
-from langchain.memory import ConversationBufferMemory
-from langchain.schema import SystemMessage, HumanMessage, AIMessage
-from langchain_community.chat_models import ChatAnthropic
-from langchain_openai import ChatOpenAI
-from langchain.tools import tool
+from langchain.schema import SystemMessage, HumanMessage
 
-from config.settings import LLM_PROVIDER, ANTHROPIC_API_KEY, OPENAI_API_KEY, ANTHROPIC_MODEL, OPENAI_MODEL
-from tools.dependency_scanner import DependencyScanner
-from tools.code_analysis import CodeAnalysisTool
-from tools.git_operations import GitOperationsTool
-from tools.compilation import CompilationTool
-from tools.test_generator import TestGeneratorTool
-from tools.vector_db import CodeVectorDB
-from utils.message_formatter import MessageFormatter, Role
+from config.settings import UPGRADE_CONCURRENCY
+from tools._registry import get_tool
+from agents.base_agent import BaseAgent
 
 logger = logging.getLogger(__name__)
 
-class UpgradeAgent:
-    def __init__(self):
-        self.vector_db = CodeVectorDB()
-        self.tools = self._setup_tools()
-        self.llm = self._setup_llm()
-        self.memory = ConversationBufferMemory(
-            memory_key="chat_history",
-            return_messages=True
-        )
-        self.agent_executor = self._setup_agent()
-    
-    def _setup_tools(self) -> List[Any]:
-        """Set up the tools for the agent."""
-        return [
-            DependencyScanner()#,
-            # CodeAnalysisTool(),
-            # GitOperationsTool(),
-            # CompilationTool(),
-            # TestGeneratorTool()
-        ]
-    def _setup_llm(self) -> Any:
-        """Set up the language model based on configuration."""
-        if LLM_PROVIDER.lower() == "anthropic":
-            return ChatAnthropic(
-                model=ANTHROPIC_MODEL,
-                anthropic_api_key=ANTHROPIC_API_KEY,
-                temperature=0.5
-            )
-        else:
-            # Remove proxies parameter as it's no longer supported in newer versions
-            return ChatOpenAI(
-                model=OPENAI_MODEL,
-                openai_api_key=OPENAI_API_KEY,
-                temperature=0.5
-            )
-    
-    def _setup_agent(self) -> AgentExecutor:
-        """Set up the agent with tools and LLM."""
-        # Create system prompt
-        system_prompt = """You are an expert software engineer specializing in dependency upgrades and code maintenance.
+# System prompt and prompt template are static, so build them once at import time
+_SYSTEM_PROMPT = """You are an expert software engineer specializing in dependency upgrades and code maintenance.
         Your task is to help upgrade dependencies in software projects, analyze the impact of these upgrades,
         implement necessary code changes, and validate the changes through testing.
         
@@ -83,49 +35,34 @@ class UpgradeAgent:
         
         Always explain your reasoning and the changes you're making.
         """
-        
-        # Create prompt template
-        prompt = ChatPromptTemplate.from_messages([
-            SystemMessage(content=system_prompt),
-            MessagesPlaceholder(variable_name="chat_history"),
-            HumanMessage(content="{input}"),
-            MessagesPlaceholder(variable_name="agent_scratchpad")
-        ])
-        
-        # Create agent
-        agent = create_openai_functions_agent(self.llm, self.tools, prompt)
-        
-        # Create agent executor
-        return AgentExecutor(
-            agent=agent,
-            tools=self.tools,
-            memory=self.memory,
-            verbose=True,
-            handle_parsing_errors=False
-        )
-    
-    def run(self, query: str) -> Dict[str, Any]:
-        """Run the agent with a query."""
-        logger.info(f"Running agent with query: {query}")
-        
-        # Format the query message
-        formatted_query = MessageFormatter.format_message(Role.USER, query)
-        print(formatted_query)
-        
-        # Run the agent
-        #result = self.agent_executor(query)
-        # print("*"*80)
-        # print(type(self.agent_executor))
-        # print(type(self.agent_executor.invoke))
-        # print("*"*80)
-        result = self.agent_executor.invoke({"input": query})
-        
-        # Format the response message
-        formatted_response = MessageFormatter.format_message(Role.ASSISTANT, result["output"])
-        print(formatted_response)
-        
-        return result
-    
+
+_PROMPT_TEMPLATE = ChatPromptTemplate.from_messages([
+    SystemMessage(content=_SYSTEM_PROMPT),
+    MessagesPlaceholder(variable_name="chat_history"),
+    HumanMessage(content="{input}"),
+    MessagesPlaceholder(variable_name="agent_scratchpad")
+])
+
+class UpgradeAgent(BaseAgent):
+    _PROMPT_TEMPLATE = _PROMPT_TEMPLATE
+    _TEMPERATURE = 0.5
+    _HANDLE_PARSING_ERRORS = False
+    _BATCH_CONCURRENCY = UPGRADE_CONCURRENCY
+    # Queries whose outcome is deterministic, answered by calling the tool directly instead of the LLM
+    _FAST_PATHS = {
+        "find upgrade candidates": ("dependency_scanner", {}),
+    }
+
+    def _setup_tools(self) -> List[Any]:
+        """Set up the tools for the agent."""
+        return [
+            get_tool("dependency_scanner")#,
+            # CodeAnalysisTool(),
+            # GitOperationsTool(),
+            # CompilationTool(),
+            # TestGeneratorTool()
+        ]
+
     def initialize_vector_db(self, force_refresh: bool = False) -> None:
         """Initialize the vector database."""
         logger.info("Initializing vector database")
@@ -140,21 +77,43 @@ class UpgradeAgent:
         
         return self.run(query)
     
-    def scan_and_upgrade_all(self) -> Dict[str, Any]:
-        """Scan the project and upgrade all dependencies that need updating."""
-        query = """
-        Please scan the project for dependencies that need upgrading.
-        For each dependency that needs an upgrade:
+    async def ascan_and_upgrade_all(self) -> Dict[str, Any]:
+        """Scan the project and upgrade all dependencies that need updating, without blocking the event loop."""
+        scan_result = await asyncio.to_thread(get_tool("dependency_scanner")._run)
+        if "error" in scan_result:
+            return {"output": scan_result["error"], "results": []}
+        
+        # A package declared in several files or constraints is upgraded by one agent run
+        candidates = {}
+        for candidate in scan_result["upgrade_candidates"]:
+            candidates.setdefault(candidate["name"], []).append(candidate)
+        if not candidates:
+            return {"output": "No upgrade candidates found", "results": []}
+        
+        # Each upgrade is independent, so run one agent query per dependency concurrently
+        queries = [
+            f"""
+        Upgrade the dependency {name} from version {declarations[0]['current_version']}
+        to version {declarations[0]['latest_version']} (declared in {', '.join(sorted({d['file'] for d in declarations}))}).
+        The project has already been scanned, so there is no need to run the dependency scanner again.
         1. Analyze the potential impact
-        2. Create a separate branch for each upgrade
+        2. Create a separate branch for the upgrade
         3. Implement necessary code changes
         4. Generate and run tests
-        5. Create a pull request for each successful upgrade
-        
-        Start by scanning the dependencies, then proceed with the upgrades one by one.
+        5. Create a pull request if the upgrade is successful
         """
+            for name, declarations in candidates.items()
+        ]
+        results = await self.arun_batch(queries)
         
-        return self.run(query)
+        return {
+            "output": f"Processed {len(results)} dependency upgrades",
+            "results": results
+        }
+    
+    def scan_and_upgrade_all(self) -> Dict[str, Any]:
+        """Scan the project and upgrade all dependencies that need updating."""
+        return asyncio.run(self.ascan_and_upgrade_all())
     
     def scan_and_find_upgrade_candidate(self) -> Dict[str, Any]:
         """Scan the project and find upgrade candidates."""
@@ -0,0 +1,21 @@
+import logging
+
+from config.settings import LLM_CACHE_TYPE, LLM_CACHE_PATH
+
+logger = logging.getLogger(__name__)
+
+def setup_llm_cache():
+    """Cache LLM responses so repeated identical prompts skip the API call."""
+    from langchain.globals import set_llm_cache
+    from langchain_community.cache import InMemoryCache, SQLiteCache
+
+    cache_type = LLM_CACHE_TYPE.lower()
+    if cache_type == "sqlite":
+        set_llm_cache(SQLiteCache(database_path=LLM_CACHE_PATH))
+        logger.info(f"Using SQLite LLM cache at {LLM_CACHE_PATH}")
+    elif cache_type == "memory":
+        set_llm_cache(InMemoryCache())
+        logger.info("Using in-memory LLM cache")
+    else:
+        set_llm_cache(None)
+        logger.info("LLM cache disabled")
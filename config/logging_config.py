@@ -1,22 +1,40 @@
+import atexit
 import logging
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 
+# Background listener that writes queued log records to the real handlers
+_listener = None
+
 def setup_logging():
-    # Create logs directory if it doesn't exist
-    log_dir = Path("logs")
-    log_dir.mkdir(exist_ok=True)
-    
-    # Configure logging
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
-        handlers=[
-            logging.FileHandler(log_dir / "upgrade_agent.log"),
-            logging.StreamHandler(sys.stdout)
-        ]
-    )
-    
+    global _listener
+
+    if _listener is None:
+        # Create logs directory if it doesn't exist
+        log_dir = Path("logs")
+        log_dir.mkdir(exist_ok=True)
+
+        # Loggers only enqueue records; file and console I/O happen on the listener thread
+        log_queue = queue.Queue(-1)
+        formatter = logging.Formatter("%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+        file_handler = logging.FileHandler(log_dir / "upgrade_agent.log", delay=True)
+        stream_handler = logging.StreamHandler(sys.stdout)
+        file_handler.setFormatter(formatter)
+        stream_handler.setFormatter(formatter)
+
+        _listener = QueueListener(log_queue, file_handler, stream_handler, respect_handler_level=True)
+        _listener.start()
+        atexit.register(_listener.stop)
+
+        # Configure logging; records are fully formatted by the listener's handlers
+        logging.basicConfig(
+            level=logging.INFO,
+            format="%(message)s",
+            handlers=[QueueHandler(log_queue)]
+        )
+
     # Return logger
     return logging.getLogger("upgrade_agent")
 
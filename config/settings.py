@@ -1,31 +1,128 @@
 import os
+import functools
+from dataclasses import dataclass
 from dotenv import load_dotenv
 from pathlib import Path
 
-# Load environment variables
-load_dotenv()
+@dataclass(frozen=True)
+class Settings:
+    # LLM Configuration
+    llm_provider: str  # anthropic or openai
+    anthropic_api_key: str
+    openai_api_key: str
+    anthropic_model: str
+    openai_model: str
 
-# LLM Configuration
-LLM_PROVIDER="openai" # anthropic or openai
-ANTHROPIC_API_KEY="<<>>"
-OPENAI_API_KEY="<<>>"
-ANTHROPIC_MODEL="claude-3-7-sonnet-20250219"
-OPENAI_MODEL="gpt-4-turbo"
+    # Local caches, by default all kept under one directory
+    cache_dir: str
 
-# LLM API Configuration
+    # LLM API Configuration
+    llm_cache_type: str  # sqlite, memory or none
+    llm_cache_path: str
 
+    # Dependency Scanner Configuration
+    version_cache_path: str  # latest package versions, kept across runs
+    version_cache_ttl: int  # seconds before a cached version is fetched again
 
-# Vector DB Configuration
-VECTOR_DB_TYPE="chroma"  # or pinecone, qdrant, etc.
-VECTOR_DB_PATH="./vector_db"
+    # Agent Configuration
+    tool_concurrency_limit: int  # max tool calls run in parallel per step
+    memory_max_tokens: int  # chat history kept in the prompt
+    upgrade_concurrency: int  # dependency upgrades run at the same time
+    test_generation_concurrency: int  # test generation LLM requests in flight at once
 
-# GitHub Configuration
-GITHUB_TOKEN="<<>>"
-GITHUB_USERNAME="<<>>"
-GITHUB_EMAIL="<<>>"
+    # Vector DB Configuration
+    vector_db_type: str  # or pinecone, qdrant, etc.
+    vector_db_path: str
+    embedding_cache_path: str  # chunk embeddings, kept across re-embeds
+    semantic_cache_distance: float  # max cosine distance at which a different path-free query reuses an earlier search's results; 0 turns this off
+    vector_db_mode: str  # local (embedded) or server (shared chroma server)
+    vector_db_host: str
+    vector_db_port: int
 
-# Get the project root directory
-REPO_LOCAL_PATH = Path("<<>>").absolute()
+    # GitHub Configuration
+    github_token: str
+    github_username: str
+    github_email: str
 
-# Ensure all required paths exist
-Path(VECTOR_DB_PATH).mkdir(parents=True, exist_ok=True)
+    # Get the project root directory
+    repo_local_path: Path
+
+@functools.lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Load settings from the environment once and cache them."""
+    # Load environment variables
+    load_dotenv()
+    cache_dir = os.getenv("CACHE_DIR", "./.cache")
+
+    settings = Settings(
+        llm_provider=os.getenv("LLM_PROVIDER", "openai"),
+        anthropic_api_key=os.getenv("ANTHROPIC_API_KEY", "<<>>"),
+        openai_api_key=os.getenv("OPENAI_API_KEY", "<<>>"),
+        anthropic_model=os.getenv("ANTHROPIC_MODEL", "claude-3-7-sonnet-20250219"),
+        openai_model=os.getenv("OPENAI_MODEL", "gpt-4-turbo"),
+        cache_dir=cache_dir,
+        llm_cache_type=os.getenv("LLM_CACHE_TYPE", "sqlite"),
+        llm_cache_path=os.getenv("LLM_CACHE_PATH", os.path.join(cache_dir, "langchain.db")),
+        version_cache_path=os.getenv("VERSION_CACHE_PATH", os.path.join(cache_dir, "version_cache.db")),
+        version_cache_ttl=int(os.getenv("VERSION_CACHE_TTL", "3600")),
+        tool_concurrency_limit=int(os.getenv("TOOL_CONCURRENCY_LIMIT", "4")),
+        memory_max_tokens=int(os.getenv("MEMORY_MAX_TOKENS", "2000")),
+        upgrade_concurrency=int(os.getenv("UPGRADE_CONCURRENCY", "4")),
+        test_generation_concurrency=int(os.getenv("TEST_GENERATION_CONCURRENCY", "4")),
+        vector_db_type=os.getenv("VECTOR_DB_TYPE", "chroma"),
+        vector_db_path=os.getenv("VECTOR_DB_PATH", "./vector_db"),
+        embedding_cache_path=os.getenv("EMBEDDING_CACHE_PATH", os.path.join(cache_dir, "embedding_cache")),
+        semantic_cache_distance=float(os.getenv("SEMANTIC_CACHE_DISTANCE", "0")),
+        vector_db_mode=os.getenv("VECTOR_DB_MODE", "local"),
+        vector_db_host=os.getenv("VECTOR_DB_HOST", "localhost"),
+        vector_db_port=int(os.getenv("VECTOR_DB_PORT", "8001")),
+        github_token=os.getenv("GITHUB_TOKEN", "<<>>"),
+        github_username=os.getenv("GITHUB_USERNAME", "<<>>"),
+        github_email=os.getenv("GITHUB_EMAIL", "<<>>"),
+        repo_local_path=Path(os.getenv("REPO_LOCAL_PATH", "<<>>")).absolute()
+    )
+
+    # Ensure all required paths exist
+    Path(settings.vector_db_path).mkdir(parents=True, exist_ok=True)
+    Path(settings.cache_dir).mkdir(parents=True, exist_ok=True)
+    # SQLite creates its database file but not missing parent directories
+    for cache_path in (settings.llm_cache_path, settings.version_cache_path):
+        Path(cache_path).parent.mkdir(parents=True, exist_ok=True)
+
+    return settings
+
+_settings = get_settings()
+
+# Module-level names kept for existing imports
+LLM_PROVIDER = _settings.llm_provider
+ANTHROPIC_API_KEY = _settings.anthropic_api_key
+OPENAI_API_KEY = _settings.openai_api_key
+ANTHROPIC_MODEL = _settings.anthropic_model
+OPENAI_MODEL = _settings.openai_model
+
+CACHE_DIR = _settings.cache_dir
+
+LLM_CACHE_TYPE = _settings.llm_cache_type
+LLM_CACHE_PATH = _settings.llm_cache_path
+
+VERSION_CACHE_PATH = _settings.version_cache_path
+VERSION_CACHE_TTL = _settings.version_cache_ttl
+
+TOOL_CONCURRENCY_LIMIT = _settings.tool_concurrency_limit
+MEMORY_MAX_TOKENS = _settings.memory_max_tokens
+UPGRADE_CONCURRENCY = _settings.upgrade_concurrency
+TEST_GENERATION_CONCURRENCY = _settings.test_generation_concurrency
+
+VECTOR_DB_TYPE = _settings.vector_db_type
+VECTOR_DB_PATH = _settings.vector_db_path
+EMBEDDING_CACHE_PATH = _settings.embedding_cache_path
+SEMANTIC_CACHE_DISTANCE = _settings.semantic_cache_distance
+VECTOR_DB_MODE = _settings.vector_db_mode
+VECTOR_DB_HOST = _settings.vector_db_host
+VECTOR_DB_PORT = _settings.vector_db_port
+
+GITHUB_TOKEN = _settings.github_token
+GITHUB_USERNAME = _settings.github_username
+GITHUB_EMAIL = _settings.github_email
+
+REPO_LOCAL_PATH = _settings.repo_local_path
@@ -1,11 +1,12 @@
 import argparse
+import asyncio
 import logging
+import subprocess
 import sys
 from pathlib import Path
 
 from config.logging_config import setup_logging
-from agents.upgrade_agent import UpgradeAgent
-from agents.test_agent import TestAgent
+from config.cache import setup_llm_cache
 from utils.message_formatter import MessageFormatter, Role
 
 logger = logging.getLogger(__name__)
@@ -20,6 +21,9 @@ def parse_args():
     init_parser = subparsers.add_parser("init", help="Initialize vector database")
     init_parser.add_argument("--force", action="store_true", help="Force refresh of vector database")
     
+    # Vector database server command
+    serve_db_parser = subparsers.add_parser("serve-db", help="Run a shared Chroma server for VECTOR_DB_MODE=server")
+    
     # Upgrade specific dependency command
     upgrade_parser = subparsers.add_parser("upgrade", help="Upgrade a specific dependency")
     upgrade_parser.add_argument("--dependency", help="Name of the dependency to upgrade")
@@ -31,6 +35,7 @@ def parse_args():
     # Generate tests command
     test_parser = subparsers.add_parser("test", help="Generate or run tests")
     test_parser.add_argument("--file", help="Path to the file to generate tests for")
+    test_parser.add_argument("--files", nargs="+", help="Paths of several files to generate tests for concurrently")
     test_parser.add_argument("--framework", help="Test framework to use")
     test_parser.add_argument("--output", help="Path to save generated tests")
     test_parser.add_argument("--run", action="store_true", help="Run tests instead of generating them")
@@ -43,26 +48,143 @@ def parse_args():
     
     return parser.parse_args()
 
-def run_interactive_mode(agent):
-    """Run the agent in interactive mode."""
-    print(MessageFormatter.format_message(Role.SYSTEM, "Starting interactive mode. Type 'exit' to quit."))
-    
+async def read_user_input(session) -> str:
+    """Read a line without blocking the event loop."""
+    if session is not None:
+        return await session.prompt_async("> ")
+    return await asyncio.to_thread(input, "> ")
+
+async def run_interactive_session(agent):
+    """Read queries and run the agent on one event loop until the user exits."""
+    # prompt_toolkit gives line editing and history; fall back to input() without it
+    try:
+        from prompt_toolkit import PromptSession
+        session = PromptSession()
+    except ImportError:
+        session = None
+
+    warm_up = None
     while True:
+        # Open the LLM connection while the user types; idle connections are dropped after a few seconds,
+        # so this is repeated for every query
+        if warm_up is None or warm_up.done():
+            warm_up = asyncio.create_task(agent.aprewarm())
+
         # Get user input
-        user_input = input("> ")
+        try:
+            user_input = await read_user_input(session)
+        except KeyboardInterrupt:
+            continue
+        except EOFError:
+            user_input = "exit"
         
-        if user_input.lower() == "exit":
-            print(MessageFormatter.format_message(Role.SYSTEM, "Exiting interactive mode."))
+        if user_input.strip().lower() == "exit":
+            MessageFormatter.print_message(Role.SYSTEM, "Exiting interactive mode.")
             break
         
         # Run the agent
         try:
-            agent.run(user_input)
+            await agent.arun(user_input)
         except Exception as e:
             error_message = f"Error: {str(e)}"
-            print(MessageFormatter.format_message(Role.SYSTEM, error_message))
+            MessageFormatter.print_message(Role.SYSTEM, error_message)
             logger.error(error_message)
 
+def run_interactive_mode(agent):
+    """Run the agent in interactive mode."""
+    MessageFormatter.print_message(Role.SYSTEM, "Starting interactive mode. Type 'exit' to quit.")
+    asyncio.run(run_interactive_session(agent))
+
+def create_agent(agent_type: str, prewarm: bool = True):
+    """Create the requested agent, importing only that agent's module."""
+    if agent_type == "test":
+        from agents.test_agent import TestAgent
+        agent = TestAgent()
+    else:
+        from agents.upgrade_agent import UpgradeAgent
+        agent = UpgradeAgent()
+
+    # Open the LLM connection in the background for commands that query the agent
+    if prewarm:
+        agent.prewarm()
+
+    return agent
+
+def handle_init(args):
+    """Initialize the vector database."""
+    agent = create_agent("upgrade", prewarm=False)
+    MessageFormatter.print_message(Role.SYSTEM, "Initializing vector database...")
+    agent.initialize_vector_db(force_refresh=args.force)
+    MessageFormatter.print_message(Role.SYSTEM, "Vector database initialized successfully.")
+
+def handle_serve_db(args):
+    """Run the Chroma server that agents connect to in server mode."""
+    from config.settings import VECTOR_DB_PATH, VECTOR_DB_HOST, VECTOR_DB_PORT
+
+    MessageFormatter.print_message(Role.SYSTEM, f"Serving vector database {VECTOR_DB_PATH} on {VECTOR_DB_HOST}:{VECTOR_DB_PORT}")
+    # The server keeps the index loaded between CLI runs; it stops with Ctrl+C
+    try:
+        subprocess.run(["chroma", "run", "--path", str(VECTOR_DB_PATH),
+                        "--host", VECTOR_DB_HOST, "--port", str(VECTOR_DB_PORT)])
+    except FileNotFoundError:
+        MessageFormatter.print_message(Role.SYSTEM, "Error: the chroma CLI was not found. Install chromadb first.")
+    except KeyboardInterrupt:
+        MessageFormatter.print_message(Role.SYSTEM, "Vector database server stopped.")
+
+def handle_scan(args):
+    """Scan all dependencies and find upgrade candidates."""
+    agent = create_agent("upgrade")
+    MessageFormatter.print_message(Role.SYSTEM, "Scanning all dependencies and finding upgrade candidate")
+    agent.scan_and_find_upgrade_candidate()
+
+def handle_upgrade(args):
+    """Upgrade a specific dependency."""
+    agent = create_agent("upgrade")
+    MessageFormatter.print_message(Role.SYSTEM, f"Upgrading dependency: {args.dependency}")
+    agent.upgrade_dependency(args.dependency, args.version)
+
+def handle_test(args):
+    """Generate or run tests."""
+    if not args.run and not args.file and not args.files:
+        MessageFormatter.print_message(Role.SYSTEM, "Error: --file or --files is required when generating tests.")
+        return
+
+    agent = create_agent("test")
+    if args.run:
+        if args.test_files:
+            MessageFormatter.print_message(Role.SYSTEM, f"Running specific test files: {args.test_files}")
+            agent.run_tests(args.test_files)
+        else:
+            MessageFormatter.print_message(Role.SYSTEM, "Running all tests...")
+            agent.run_tests()
+    elif args.files:
+        MessageFormatter.print_message(Role.SYSTEM, f"Generating tests for: {', '.join(args.files)}")
+        agent.generate_tests_for_files(args.files, args.framework)
+    else:
+        MessageFormatter.print_message(Role.SYSTEM, f"Generating tests for: {args.file}")
+        agent.generate_tests_for_file(args.file, args.framework, args.output)
+
+def handle_interactive(args):
+    """Run the chosen agent in interactive mode."""
+    agent = create_agent(args.agent)
+    agent_type = "Test" if args.agent == "test" else "Upgrade"
+    MessageFormatter.print_message(Role.SYSTEM, f"Starting interactive mode with {agent_type} Agent.")
+    run_interactive_mode(agent)
+
+def handle_help(args):
+    """Point to the help when no command is given."""
+    MessageFormatter.print_message(Role.SYSTEM, "No command specified. Use --help for available commands.")
+
+# Each handler creates only the agent its command needs
+COMMAND_HANDLERS = {
+    "init": handle_init,
+    "serve-db": handle_serve_db,
+    "scan": handle_scan,
+    "upgrade": handle_upgrade,
+    "test": handle_test,
+    "interactive": handle_interactive,
+}
+
 def main():
     """Main entry point."""
     # Set up logging
@@ -70,52 +192,22 @@ def main():
     
     # Parse arguments
     args = parse_args()
-    
-    # Create the appropriate agent based on the command
-    if args.command == "test" or (args.command == "interactive" and args.agent == "test"):
-        agent = TestAgent()
-    else:
-        agent = UpgradeAgent()
+
+    # Reuse responses for prompts that were already answered
+    setup_llm_cache()
     
     # Handle commands
-    if args.command == "init":
-        print(MessageFormatter.format_message(Role.SYSTEM, "Initializing vector database..."))
-        agent.initialize_vector_db(force_refresh=args.force)
-        print(MessageFormatter.format_message(Role.SYSTEM, "Vector database initialized successfully."))
-
-    elif args.command == "scan":
-        print(MessageFormatter.format_message(Role.SYSTEM, "Scanning all dependencies and finding upgrade candidate"))
-        agent.scan_and_find_upgrade_candidate()
-
-    elif args.command == "upgrade":
-        print(MessageFormatter.format_message(Role.SYSTEM, f"Upgrading dependency: {args.dependency}"))
-        agent.upgrade_dependency(args.dependency, args.version)
-    
+    COMMAND_HANDLERS.get(args.command, handle_help)(args)
 
-    
-    elif args.command == "test":
-        if args.run:
-            if args.test_files:
-                print(MessageFormatter.format_message(Role.SYSTEM, f"Running specific test files: {args.test_files}"))
-                agent.run_tests(args.test_files)
-            else:
-                print(MessageFormatter.format_message(Role.SYSTEM, "Running all tests..."))
-                agent.run_tests()
-        else:
-            if not args.file:
-                print(MessageFormatter.format_message(Role.SYSTEM, "Error: --file is required when generating tests."))
-                return
-            
-            print(MessageFormatter.format_message(Role.SYSTEM, f"Generating tests for: {args.file}"))
-            agent.generate_tests_for_file(args.file, args.framework, args.output)
-    
-    elif args.command == "interactive":
-        agent_type = "Test" if args.agent == "test" else "Upgrade"
-        print(MessageFormatter.format_message(Role.SYSTEM, f"Starting interactive mode with {agent_type} Agent."))
-        run_interactive_mode(agent)
-    
-    else:
-        print(MessageFormatter.format_message(Role.SYSTEM, "No command specified. Use --help for available commands."))
+def install_event_loop():
+    """Use uvloop for the async batch paths when it is available."""
+    try:
+        import uvloop
+    except ImportError:
+        return
+    # Every later asyncio.run call picks up the faster libuv-based loop
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
 
 if __name__ == "__main__":
+    install_event_loop()
     main()
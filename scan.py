@@ -5,8 +5,7 @@ from langchain.agents import create_openai_functions_agent, AgentExecutor
 from langchain_openai import ChatOpenAI
 from langchain.tools import tool
 from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
-from tools.dependency_scanner import DependencyScanner
-from tools.code_analysis import CodeAnalysisTool
+from tools._registry import get_tool
 
 print(os.environ["PYTHONPATH"])
 # Define tools properly with decorators
@@ -30,8 +29,8 @@ prompt = ChatPromptTemplate.from_messages([
 ])
 
 # Create the agent with functions explicitly
-tools = [DependencyScanner(),
-            CodeAnalysisTool()]
+tools = [get_tool("dependency_scanner"),
+            get_tool("code_analysis")]
 agent = create_openai_functions_agent(llm, tools, prompt)
 
 # Create the executor
@@ -0,0 +1,16 @@
+import os
+import tempfile
+from pathlib import Path
+
+# Settings are read once when config.settings is first imported, so every path they create or write
+# is pointed at a scratch directory before any project module loads
+_SCRATCH = Path(tempfile.mkdtemp(prefix="auto-upgrade-tests-"))
+(_SCRATCH / "repo").mkdir()
+
+os.environ["REPO_LOCAL_PATH"] = str(_SCRATCH / "repo")
+os.environ["CACHE_DIR"] = str(_SCRATCH / "cache")
+os.environ["VECTOR_DB_PATH"] = str(_SCRATCH / "vector_db")
+os.environ["VECTOR_DB_MODE"] = "local"
+os.environ["LLM_CACHE_TYPE"] = "none"
+os.environ["SEMANTIC_CACHE_DISTANCE"] = "0"
+os.environ.setdefault("OPENAI_API_KEY", "sk-test")
@@ -0,0 +1,100 @@
+import asyncio
+
+from langchain.schema import AgentAction
+
+from agents.base_agent import BaseAgent
+from agents.parallel_executor import ParallelToolExecutor, serialize_observation
+
+class Tool:
+    def __init__(self, name, safe=False, safe_operations=None):
+        self.name = name
+        self.is_concurrency_safe = safe
+        if safe_operations is not None:
+            self.is_concurrency_safe_call = lambda tool_input: tool_input.get("operation") in safe_operations
+
+def _action(tool, **tool_input):
+    return AgentAction(tool=tool, tool_input=tool_input, log="")
+
+def test_partition_groups_consecutive_actions_by_safety():
+    tools = {
+        "search": Tool("search", safe=True),
+        "write": Tool("write"),
+        "code": Tool("code", safe_operations={"get_file"}),
+    }
+    actions = [
+        _action("search", q=1),
+        _action("code", operation="get_file"),
+        _action("code", operation="modify_file"),
+        _action("write"),
+        _action("search", q=2),
+        _action("unknown"),
+    ]
+
+    groups = ParallelToolExecutor._partition(None, tools, actions)
+
+    assert [(safe, [action.tool for action in group]) for safe, group in groups] == [
+        (True, ["search", "code"]),
+        (False, ["code", "write"]),
+        (True, ["search"]),
+        (False, ["unknown"]),
+    ]
+
+def test_serialize_observation():
+    assert serialize_observation("text") == "text"
+    assert serialize_observation({"a": [1, 2]}) == '{"a":[1,2]}'
+    assert serialize_observation({1: "x"}, indent=True) == '{\n  "1": "x"\n}'
+
+class BatchAgent(BaseAgent):
+    """An agent whose runs only record how many overlap."""
+    _BATCH_CONCURRENCY = 2
+
+    def __init__(self):
+        self.batch_executor = None
+        self.running = 0
+        self.max_running = 0
+
+    def _setup_tools(self):
+        return []
+
+    async def arun(self, query, executor=None):
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await asyncio.sleep(0.01)
+        self.running -= 1
+        return {"input": query, "output": query.upper()}
+
+def test_run_batch_is_bounded_and_keeps_query_order():
+    agent = BatchAgent()
+
+    results = agent.run_batch([f"q{index}" for index in range(7)])
+
+    assert [result["output"] for result in results] == [f"Q{index}" for index in range(7)]
+    assert agent.max_running == 2
+
+class FastPathAgent(BaseAgent):
+    """An agent with one deterministic query and no LLM."""
+    _FAST_PATHS = {"list things": ("lister", {"limit": 2})}
+
+    def __init__(self):
+        self.tools = [self.Lister()]
+        self.memory = None
+
+    class Lister:
+        name = "lister"
+
+        def _run(self, limit):
+            return {"things": list(range(limit))}
+
+    def _setup_tools(self):
+        return self.tools
+
+def test_fast_path_answers_without_the_llm():
+    agent = FastPathAgent()
+    expected = serialize_observation({"things": [0, 1]}, indent=True)
+
+    assert agent.run(" List things ")["output"] == expected
+
+    class Executor:
+        memory = None
+
+    assert asyncio.run(agent.arun("list things", Executor()))["output"] == expected
@@ -0,0 +1,70 @@
+import os
+
+import pytest
+
+from tools import code_analysis
+from tools.code_analysis import CodeAnalysisTool, _analyze_path, _translate_newlines
+
+def _count(original, new):
+    # The line count doesn't use the tool's state
+    return CodeAnalysisTool._count_changed_lines(None, original, new)
+
+@pytest.mark.parametrize("original, new, expected", [
+    ("a\nb\nc\n", "a\nb\nc\n", 0),
+    ("a\nb\nc\n", "a\nx\nc\n", 2),
+    ("a\nb\nc\n", "a\nb\nnew\nc\n", 1),
+    ("a\nb\nc\n", "a\nc\n", 1),
+    ("a\nb\nc\n", "x\ny\nz\n", 6),
+])
+def test_count_changed_lines(original, new, expected):
+    assert _count(original, new) == expected
+
+def test_count_changed_lines_does_not_depend_on_file_size():
+    # The same edit counts the same in a small and a large file
+    small = [f"line {index}" for index in range(10)]
+    large = [f"line {index}" for index in range(5000)]
+    for lines in (small, large):
+        edited = list(lines)
+        edited[5] = "changed"
+        edited.insert(7, "inserted")
+        assert _count("\n".join(lines), "\n".join(edited)) == 3
+
+def test_translate_newlines():
+    assert _translate_newlines("a\r\nb\rc\n") == "a\nb\nc\n"
+    assert _translate_newlines("a\nb") == "a\nb"
+
+def test_analysis_cache_keeps_no_content(tmp_path):
+    source = tmp_path / "module.py"
+    source.write_text("import os\n\nclass A:\n    pass\n\ndef f():\n    return 1\n", encoding="utf-8")
+    st = os.stat(source)
+
+    first = _analyze_path(str(source), st.st_mtime_ns, st.st_size)
+    second = _analyze_path(str(source), st.st_mtime_ns, st.st_size)
+
+    assert first == second
+    assert first["content"] == source.read_text(encoding="utf-8")
+    assert first["classes"] == ["A"] and first["functions"] == ["f"] and first["imports"] == ["os"]
+    cached = code_analysis._analysis_cache[(str(source), st.st_mtime_ns, st.st_size)]
+    assert "content" not in cached
+
+def test_analysis_cache_is_bounded(tmp_path, monkeypatch):
+    monkeypatch.setattr(code_analysis, "_ANALYSIS_CACHE_SIZE", 2)
+    monkeypatch.setattr(code_analysis, "_analysis_cache", type(code_analysis._analysis_cache)())
+    for index in range(3):
+        source = tmp_path / f"m{index}.py"
+        source.write_text(f"x = {index}\n", encoding="utf-8")
+        st = os.stat(source)
+        _analyze_path(str(source), st.st_mtime_ns, st.st_size)
+
+    assert [key[0] for key in code_analysis._analysis_cache] == [str(tmp_path / "m1.py"), str(tmp_path / "m2.py")]
+
+def test_modified_files_are_analyzed_again(tmp_path):
+    source = tmp_path / "module.py"
+    source.write_text("def f():\n    pass\n", encoding="utf-8")
+    st = os.stat(source)
+    assert _analyze_path(str(source), st.st_mtime_ns, st.st_size)["functions"] == ["f"]
+
+    source.write_text("def g():\n    pass\n\ndef h():\n    pass\n", encoding="utf-8")
+    os.utime(source, ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+    st = os.stat(source)
+    assert _analyze_path(str(source), st.st_mtime_ns, st.st_size)["functions"] == ["g", "h"]
@@ -0,0 +1,30 @@
+from tools.compilation import _OutputTail, _TRUNCATED_MARKER
+
+def test_output_under_the_limit_is_kept_whole():
+    tail = _OutputTail(max_bytes=100)
+    for chunk in (b"line 1\n", b"line 2\n", b"line 3\n"):
+        tail.append(chunk)
+
+    assert tail.text() == "line 1\nline 2\nline 3\n"
+    assert not tail.truncated
+
+def test_output_over_the_limit_keeps_the_last_bytes_and_is_marked():
+    tail = _OutputTail(max_bytes=8)
+    for index in range(100):
+        tail.append(f"{index:04d}\n".encode())
+
+    assert tail.text() == _TRUNCATED_MARKER + "98\n0099\n"
+    # Chunks no longer needed for the last max_bytes are evicted as output arrives
+    assert tail.size - len(tail.chunks[0]) < 8
+
+def test_a_single_large_chunk_is_trimmed_and_marked():
+    tail = _OutputTail(max_bytes=4)
+    tail.append(b"abcdefgh")
+
+    assert tail.text() == _TRUNCATED_MARKER + "efgh"
+
+def test_a_character_cut_in_half_is_dropped():
+    tail = _OutputTail(max_bytes=3)
+    tail.append("xé!!".encode())  # é is two bytes, the tail starts in its middle
+
+    assert tail.text() == _TRUNCATED_MARKER + "!!"
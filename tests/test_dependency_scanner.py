@@ -0,0 +1,118 @@
+import pytest
+
+from tools import dependency_scanner
+from tools.dependency_scanner import DependencyScanner, _is_newer, _iter_pom_dependencies, _match_pom_dependencies
+
+@pytest.fixture
+def scanner():
+    return DependencyScanner()
+
+@pytest.mark.parametrize("latest, current, expected", [
+    ("2.0.0", "1.9.9", True),
+    ("1.10", "1.9", True),
+    ("1.0", "1.0.0", False),
+    ("1.0.0rc1", "1.0.0", False),
+    ("1.0.0", "1.0.0rc1", True),
+    # Versions that don't parse are only compared for equality
+    ("abc", "abd", True),
+    ("abc", "abc", False),
+])
+def test_is_newer(latest, current, expected):
+    assert _is_newer(latest, current) is expected
+
+def test_parse_requirements_txt(scanner, tmp_path):
+    requirements = tmp_path / "requirements.txt"
+    requirements.write_text(
+        "# pinned\n"
+        "requests==2.31.0\n"
+        "baz ~= 1.4  # trailing comment\n"
+        "foo>=1.0,<2.0\n"
+        "qux[extra]==1.2; python_version > '3'\n"
+        "upper<3\n"
+        "-r other.txt\n"
+        "\n"
+        "Django>1.0\n",
+        encoding="utf-8"
+    )
+
+    dependencies = scanner._parse_requirements_txt(requirements)
+
+    assert [(d["name"], d["version"], d["constraint"]) for d in dependencies] == [
+        ("requests", "2.31.0", "=="),
+        ("baz", "1.4", "~="),
+        ("foo", "1.0", ">="),
+        ("qux", "1.2", "=="),
+        ("Django", "1.0", ">"),
+    ]
+    assert all(d["file"] == str(requirements) for d in dependencies)
+
+_POM = """<?xml version="1.0" encoding="UTF-8"?>
+<project xmlns="http://maven.apache.org/POM/4.0.0">
+  <dependencyManagement>
+    <dependencies>
+      <dependency><groupId>org.managed</groupId><artifactId>bom</artifactId><version>3.0</version></dependency>
+    </dependencies>
+  </dependencyManagement>
+  <dependencies>
+    <dependency>
+      <groupId>org.a</groupId>
+      <artifactId>a</artifactId>
+      <!-- <version>0.1</version> -->
+      <version>${a.version}</version>
+    </dependency>
+    <!--
+    <dependency><groupId>org.b</groupId><artifactId>b</artifactId><version>1.0</version></dependency>
+    -->
+    <dependency>
+      <version> 1.0 </version>
+      <artifactId>c</artifactId>
+      <groupId>org.c</groupId>
+      <exclusions>
+        <exclusion><groupId>org.x</groupId><artifactId>x</artifactId><version>9</version></exclusion>
+      </exclusions>
+    </dependency>
+    <dependency><groupId>org.d</groupId><artifactId>no-version</artifactId></dependency>
+    <dependency><groupId>org.e</groupId><artifactId>blank</artifactId><version> </version></dependency>
+    <dependency><groupId>h&lt;</groupId><artifactId>h</artifactId><version>5</version><version>6</version></dependency>
+  </dependencies>
+</project>
+"""
+
+_POM_DEPENDENCIES = [
+    ("org.managed", "bom", "3.0"),
+    ("org.a", "a", "${a.version}"),
+    ("org.c", "c", "1.0"),
+    ("h<", "h", "5"),
+]
+
+def test_pom_regex_and_stream_parsers_agree(tmp_path):
+    pom = tmp_path / "pom.xml"
+    pom.write_text(_POM, encoding="utf-8")
+
+    assert list(_match_pom_dependencies(_POM)) == _POM_DEPENDENCIES
+    assert list(_iter_pom_dependencies(pom)) == _POM_DEPENDENCIES
+
+@pytest.mark.parametrize("stream_min_size", [1, 10 ** 9])
+def test_parse_pom_xml_either_side_of_stream_threshold(scanner, tmp_path, monkeypatch, stream_min_size):
+    monkeypatch.setattr(dependency_scanner, "_POM_STREAM_MIN_SIZE", stream_min_size)
+    pom = tmp_path / "pom.xml"
+    pom.write_text(_POM, encoding="utf-8")
+
+    dependencies = scanner._parse_pom_xml(pom)
+
+    assert [(d["group_id"], d["artifact_id"], d["version"]) for d in dependencies] == _POM_DEPENDENCIES
+    assert dependencies[0]["name"] == "org.managed:bom"
+
+def test_detect_project_type_collects_nested_files(scanner, tmp_path):
+    (tmp_path / "requirements.txt").write_text("a==1\n")
+    (tmp_path / "service").mkdir()
+    (tmp_path / "service" / "requirements.txt").write_text("b==1\n")
+    (tmp_path / "web").mkdir()
+    (tmp_path / "web" / "package.json").write_text("{}")
+    (tmp_path / "node_modules").mkdir()
+    (tmp_path / "node_modules" / "requirements.txt").write_text("c==1\n")
+
+    project_type, files = scanner._detect_project_type(tmp_path)
+
+    assert project_type == "python"
+    assert sorted(files) == [tmp_path / "requirements.txt", tmp_path / "service" / "requirements.txt"]
@@ -0,0 +1,67 @@
+import pytest
+
+from tools import test_generator
+from tools.test_generator import TestGeneratorTool, _find_files, _get_streamed_tests, _put_streamed_tests, _python_test_framework
+
+# Not a test class, despite its name
+TestGeneratorTool.__test__ = False
+
+@pytest.fixture
+def project(tmp_path):
+    (tmp_path / "node_modules" / "dep").mkdir(parents=True)
+    (tmp_path / "pkg" / "tests").mkdir(parents=True)
+    return tmp_path
+
+def test_python_test_framework_defaults_to_unittest(project):
+    # Files under ignored directories don't count
+    (project / "node_modules" / "dep" / "conftest.py").write_text("")
+    assert _python_test_framework(project) == "unittest"
+
+@pytest.mark.parametrize("name, content", [
+    ("pytest.ini", ""),
+    ("conftest.py", ""),
+    ("pyproject.toml", "[tool.pytest.ini_options]\n"),
+    ("setup.cfg", "[tool:pytest]\n"),
+    ("tox.ini", "[pytest]\n"),
+])
+def test_python_test_framework_reads_top_level_config(project, name, content):
+    (project / name).write_text(content)
+    assert _python_test_framework(project) == "pytest"
+
+def test_python_test_framework_sees_files_added_later(project):
+    (project / "pyproject.toml").write_text("[tool.black]\n")
+    assert _python_test_framework(project) == "unittest"
+    (project / "pkg" / "tests" / "conftest.py").write_text("")
+    assert _python_test_framework(project) == "pytest"
+
+def test_find_files_orders_by_pattern_and_skips_ignored_directories(project):
+    for path in ("a_test.py", "pkg/test_b.py", "pkg/tests/test_c.py", "node_modules/dep/test_d.py"):
+        (project / path).write_text("")
+
+    found = _find_files(project, ("test_*.py", "*_test.py"))
+
+    assert sorted(found[:2]) == [project / "pkg" / "test_b.py", project / "pkg" / "tests" / "test_c.py"]
+    assert found[2:] == [project / "a_test.py"]
+
+def test_streamed_tests_cache_evicts_least_recently_used(monkeypatch):
+    monkeypatch.setattr(test_generator, "_STREAMED_TESTS_CACHE_SIZE", 2)
+    monkeypatch.setattr(test_generator, "_streamed_tests", type(test_generator._streamed_tests)())
+    _put_streamed_tests("a", "tests a")
+    _put_streamed_tests("b", "tests b")
+    assert _get_streamed_tests("a") == "tests a"
+    _put_streamed_tests("c", "tests c")
+
+    assert _get_streamed_tests("b") is None
+    assert _get_streamed_tests("a") == "tests a" and _get_streamed_tests("c") == "tests c"
+    # Without a key, as when caching is off, nothing is stored
+    _put_streamed_tests(None, "ignored")
+    assert _get_streamed_tests(None) is None
+
+def test_complete_block_and_extraction():
+    tool = TestGeneratorTool.__new__(TestGeneratorTool)
+    chunks = ["Here:\n```python\n", "def test_a():\n    pass\n", "``", "`\nmore"]
+
+    assert not tool._has_complete_block(chunks[:2], chunks[1])
+    assert not tool._has_complete_block(chunks[:3], chunks[2])
+    assert tool._has_complete_block(chunks, chunks[3])
+    assert tool._extract_tests("".join(chunks)) == "def test_a():\n    pass"
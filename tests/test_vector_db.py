@@ -0,0 +1,138 @@
+import shutil
+import uuid
+
+import pytest
+from langchain.schema import Document
+
+from config.settings import REPO_LOCAL_PATH
+from tools import vector_db
+from tools.vector_db import CodeVectorDB
+
+class FakeStore:
+    """In-memory stand-in for the Chroma collection, recording searches."""
+
+    def __init__(self, **kwargs):
+        self.documents = {}
+        self.searches = 0
+
+    def similarity_search_by_vector_with_relevance_scores(self, embedding, k):
+        self.searches += 1
+        return [(Document(page_content=f"result {self.searches}", metadata={"source": "a.py"}), 0.1)] * k
+
+    def get(self, where, include):
+        sources = where["source"]["$in"]
+        return {"ids": [doc_id for doc_id, doc in self.documents.items() if doc.metadata["source"] in sources]}
+
+    def delete(self, ids):
+        for doc_id in ids:
+            del self.documents[doc_id]
+
+    def add_documents(self, documents):
+        for document in documents:
+            self.documents[str(uuid.uuid4())] = document
+
+    def persist(self):
+        pass
+
+class FakeEmbeddings:
+    def embed_documents(self, texts):
+        return [[1.0, float(len(text))] for text in texts]
+
+@pytest.fixture
+def db(tmp_path):
+    db = CodeVectorDB()
+    db.vector_db_path = str(tmp_path / "index")
+    db.vector_store = FakeStore()
+    return db
+
+def _search(db, query, embedding, n_results=2):
+    return db._search(query, embedding, n_results)[0]["content"]
+
+def test_same_query_text_reuses_results(db):
+    assert _search(db, "where is auth handled", [1.0, 0.0]) == "result 1"
+    assert _search(db, "where  is auth handled", [1.0, 0.0]) == "result 1"
+    assert db.vector_store.searches == 1
+
+def test_cached_results_must_cover_the_requested_count(db):
+    _search(db, "query", [1.0, 0.0], n_results=2)
+    _search(db, "query", [1.0, 0.0], n_results=5)
+    _search(db, "query", [1.0, 0.0], n_results=1)
+    assert db.vector_store.searches == 2
+
+def test_expired_results_are_searched_again(db, monkeypatch):
+    _search(db, "query", [1.0, 0.0])
+    monkeypatch.setattr(vector_db, "_QUERY_CACHE_TTL_SECONDS", -1)
+    _search(db, "query", [1.0, 0.0])
+    assert db.vector_store.searches == 2
+    assert len(db._query_cache) == 1 and db._query_cache_vectors.shape[0] == 1
+
+def test_oldest_results_are_evicted(db, monkeypatch):
+    monkeypatch.setattr(vector_db, "_QUERY_CACHE_SIZE", 2)
+    for query in ("first", "second", "third"):
+        _search(db, query, [1.0, 0.0])
+    assert [entry[0] for entry in db._query_cache] == ["second", "third"]
+    assert db._query_cache_vectors.shape[0] == 2
+
+def test_similar_queries_are_not_reused_by_default(db):
+    _search(db, "where is auth handled", [1.0, 0.0])
+    _search(db, "where is auth done", [1.0, 0.001])
+    assert db.vector_store.searches == 2
+
+def test_similar_queries_reuse_results_when_enabled(db, monkeypatch):
+    monkeypatch.setattr(vector_db, "_QUERY_CACHE_SIMILARITY", 0.99)
+    _search(db, "where is auth handled", [1.0, 0.0])
+    assert _search(db, "where is auth done", [1.0, 0.001]) == "result 1"
+    assert db.vector_store.searches == 1
+
+def test_queries_with_paths_never_reuse_other_results(db, monkeypatch):
+    monkeypatch.setattr(vector_db, "_QUERY_CACHE_SIMILARITY", 0.99)
+    _search(db, "code similar to src/a.py", [1.0, 0.0])
+    assert _search(db, "code similar to src/b.py", [1.0, 0.001]) == "result 2"
+    # Nor does a path-free query reuse the results of one with a path
+    assert _search(db, "code similar", [1.0, 0.001]) == "result 3"
+
+def test_zero_query_embedding_is_searched(db, monkeypatch):
+    monkeypatch.setattr(vector_db, "_QUERY_CACHE_SIMILARITY", 0.0)
+    _search(db, "first", [0.0, 0.0])
+    assert _search(db, "second", [0.0, 0.0]) == "result 2"
+
+@pytest.fixture
+def project():
+    # Sources are recorded relative to the configured repository
+    path = REPO_LOCAL_PATH / f"project-{uuid.uuid4()}"
+    path.mkdir()
+    yield path
+    shutil.rmtree(path)
+
+def test_embed_project_only_re_embeds_changed_files(db, project, monkeypatch):
+    store = FakeStore()
+    monkeypatch.setattr(vector_db, "Chroma", lambda **kwargs: store)
+    db.embeddings = FakeEmbeddings()
+    (project / "a.py").write_text("a = 1\n")
+    (project / "b.py").write_text("b = 1\n")
+    (project / "c.py").write_text("c = 1\n")
+
+    def sources():
+        return sorted(doc.metadata["source"].rsplit("/", 1)[-1] for doc in store.documents.values())
+
+    db.embed_project(project_path=project)
+    assert sources() == ["a.py", "b.py", "c.py"]
+
+    # Unchanged files are not loaded again
+    loaded = []
+    load_documents = db._load_documents
+    monkeypatch.setattr(db, "_load_documents", lambda paths: loaded.extend(paths) or load_documents(paths))
+    db.embed_project(project_path=project)
+    assert loaded == []
+
+    (project / "a.py").write_text("a = 2\n")
+    (project / "b.py").unlink()
+    db.embed_project(project_path=project)
+    assert [path.name for path in loaded] == ["a.py"]
+    assert sources() == ["a.py", "c.py"]
+    assert [doc.page_content for doc in store.documents.values() if doc.metadata["source"].endswith("a.py")] == ["a = 2"]
+
+    # A forced refresh re-embeds everything
+    loaded.clear()
+    db.embed_project(project_path=project, force_refresh=True)
+    assert sorted(path.name for path in loaded) == ["a.py", "c.py"]
@@ -0,0 +1,43 @@
+import uuid
+
+from tools._version_cache import get_latest
+
+def _fetcher(*versions):
+    """A fetch callable returning the given versions in turn, recording each call."""
+    calls = []
+
+    def fetch():
+        calls.append(None)
+        return versions[len(calls) - 1]
+
+    return fetch, calls
+
+def test_fresh_entries_are_served_from_the_cache():
+    name = f"pkg-{uuid.uuid4()}"
+    fetch, calls = _fetcher("1.0", "2.0")
+
+    assert get_latest("python", name, fetch) == "1.0"
+    assert get_latest("python", name, fetch) == "1.0"
+    assert len(calls) == 1
+
+def test_expired_entries_are_fetched_again():
+    name = f"pkg-{uuid.uuid4()}"
+    fetch, calls = _fetcher("1.0", "2.0")
+
+    assert get_latest("python", name, fetch) == "1.0"
+    assert get_latest("python", name, fetch, ttl=0) == "2.0"
+    assert len(calls) == 2
+
+def test_failed_lookups_are_not_cached():
+    name = f"pkg-{uuid.uuid4()}"
+    fetch, calls = _fetcher(None, "1.0")
+
+    assert get_latest("python", name, fetch) is None
+    assert get_latest("python", name, fetch) == "1.0"
+    assert len(calls) == 2
+
+def test_ecosystems_are_cached_separately():
+    name = f"pkg-{uuid.uuid4()}"
+
+    assert get_latest("python", name, lambda: "1.0") == "1.0"
+    assert get_latest("nodejs", name, lambda: "2.0") == "2.0"
@@ -0,0 +1,19 @@
+import functools
+import importlib
+from typing import Any
+
+# Tool name -> (module, class); modules are only imported when the tool is first requested
+_TOOLS = {
+    "dependency_scanner": ("tools.dependency_scanner", "DependencyScanner"),
+    "code_analysis": ("tools.code_analysis", "CodeAnalysisTool"),
+    "compilation": ("tools.compilation", "CompilationTool"),
+    "git_operations": ("tools.git_operations", "GitOperationsTool"),
+    "test_generator": ("tools.test_generator", "TestGeneratorTool"),
+}
+
+@functools.lru_cache(maxsize=None)
+def get_tool(name: str) -> Any:
+    """Get the shared instance of a tool, so agents reuse its clients and caches."""
+    module_name, class_name = _TOOLS[name]
+    tool_class = getattr(importlib.import_module(module_name), class_name)
+    return tool_class()
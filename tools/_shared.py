@@ -0,0 +1,35 @@
+import functools
+import logging
+from typing import Any
+
+from config.settings import ANTHROPIC_API_KEY, OPENAI_API_KEY
+
+logger = logging.getLogger(__name__)
+
+@functools.lru_cache(maxsize=4)
+def get_llm(provider: str, model: str, temperature: float) -> Any:
+    """Get a shared chat model so its HTTP connection pool is reused across agents."""
+    logger.info(f"Creating {provider} chat model {model} (temperature={temperature})")
+    # Import only the provider SDK that is actually used
+    if provider.lower() == "anthropic":
+        from langchain_community.chat_models import ChatAnthropic
+        return ChatAnthropic(
+            model=model,
+            anthropic_api_key=ANTHROPIC_API_KEY,
+            temperature=temperature
+        )
+    else:
+        from langchain_openai import ChatOpenAI
+        # Remove proxies parameter as it's no longer supported in newer versions
+        return ChatOpenAI(
+            model=model,
+            openai_api_key=OPENAI_API_KEY,
+            temperature=temperature
+        )
+
+@functools.lru_cache(maxsize=1)
+def get_vector_db() -> Any:
+    """Get the shared vector database handle."""
+    # Chroma and the embeddings client are only loaded when the vector DB is needed
+    from tools.vector_db import CodeVectorDB
+    return CodeVectorDB()
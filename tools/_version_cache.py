@@ -0,0 +1,53 @@
+import time
+import sqlite3
+import logging
+import functools
+import threading
+from typing import Callable, Optional
+
+from config.settings import VERSION_CACHE_PATH, VERSION_CACHE_TTL
+
+logger = logging.getLogger(__name__)
+
+# One connection is shared by the scanner's worker threads, so access is serialized
+_lock = threading.Lock()
+
+@functools.lru_cache(maxsize=1)
+def _get_connection() -> sqlite3.Connection:
+    """Open the cache database once, creating its table on first use."""
+    connection = sqlite3.connect(VERSION_CACHE_PATH, check_same_thread=False)
+    connection.execute(
+        "CREATE TABLE IF NOT EXISTS latest_versions (key TEXT PRIMARY KEY, version TEXT, fetched_at REAL)"
+    )
+    return connection
+
+def get_latest(ecosystem: str, name: str, fetch: Callable[[], Optional[str]],
+               ttl: int = VERSION_CACHE_TTL) -> Optional[str]:
+    """Get the latest version of a package, from the cache while it is fresh, otherwise from fetch()."""
+    key = f"{ecosystem}:{name}"
+    try:
+        with _lock:
+            row = _get_connection().execute(
+                "SELECT version, fetched_at FROM latest_versions WHERE key = ?", (key,)
+            ).fetchone()
+        if row and time.time() - row[1] < ttl:
+            return row[0]
+    except sqlite3.Error as e:
+        logger.warning(f"Version cache unavailable: {str(e)}")
+        return fetch()
+
+    version = fetch()
+
+    # Failed lookups are not cached, so they are retried on the next run
+    if version is not None:
+        try:
+            with _lock:
+                connection = _get_connection()
+                connection.execute(
+                    "INSERT OR REPLACE INTO latest_versions VALUES (?, ?, ?)", (key, version, time.time())
+                )
+                connection.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Could not cache version of {key}: {str(e)}")
+
+    return version
@@ -1,16 +1,165 @@
 import os
+import re
+import ast
+import functools
 import logging
+import mmap
+import threading
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple, Union
 
 from langchain.tools import BaseTool
 from pydantic import BaseModel, Field
 
 from config.settings import REPO_LOCAL_PATH
+from utils.file_utils import write_text_atomic
 from tools.vector_db import CodeVectorDB
+from tools._shared import get_vector_db
+
+try:
+    from cdifflib import CSequenceMatcher as SequenceMatcher
+except ImportError:
+    from difflib import SequenceMatcher
+
+try:
+    from tree_sitter_languages import get_language, get_parser
+except ImportError:
+    get_language = get_parser = None
 
 logger = logging.getLogger(__name__)
 
+# Patterns for the regex analyzers, compiled once
+_PY_IMPORT_RE = re.compile(r'^import\s+(\w+)|^from\s+(\w+(?:\.\w+)*)\s+import', re.MULTILINE)
+_PY_CLASS_RE = re.compile(r'class\s+(\w+)')
+_PY_FUNCTION_RE = re.compile(r'def\s+(\w+)')
+_JS_IMPORT_RE = re.compile(r'(?:import|require)\s*\(?[\'"](.+?)[\'"]')
+_JS_CLASS_RE = re.compile(r'class\s+(\w+)')
+_JS_FUNCTION_RE = re.compile(r'(?:function|const|let|var)\s+(\w+)\s*\(')
+_JAVA_IMPORT_RE = re.compile(r'import\s+(.+?);')
+_JAVA_CLASS_RE = re.compile(r'(?:public|private|protected)?\s*class\s+(\w+)')
+_JAVA_METHOD_RE = re.compile(r'(?:public|private|protected)?\s*(?:static)?\s*\w+\s+(\w+)\s*\(')
+
+# Tree-sitter queries per language; each capture name is a key of the analysis result
+_TREE_SITTER_QUERIES = {
+    "javascript": """
+        (import_statement source: (string) @imports)
+        (call_expression
+            function: (identifier) @_function
+            arguments: (arguments . (string) @imports)
+            (#eq? @_function "require"))
+        (class_declaration name: (identifier) @classes)
+        (function_declaration name: (identifier) @functions)
+        (variable_declarator name: (identifier) @functions value: [(arrow_function) (function)])
+    """,
+    # TypeScript class names are type identifiers, and classes may be abstract
+    "typescript": """
+        (import_statement source: (string) @imports)
+        (call_expression
+            function: (identifier) @_function
+            arguments: (arguments . (string) @imports)
+            (#eq? @_function "require"))
+        (class_declaration name: (type_identifier) @classes)
+        (abstract_class_declaration name: (type_identifier) @classes)
+        (function_declaration name: (identifier) @functions)
+        (variable_declarator name: (identifier) @functions value: [(arrow_function) (function)])
+    """,
+    "java": """
+        (import_declaration) @imports
+        (class_declaration name: (identifier) @classes)
+        (method_declaration name: (identifier) @methods)
+    """,
+}
+# TSX is TypeScript with JSX, matched by the same query
+_TREE_SITTER_QUERIES["tsx"] = _TREE_SITTER_QUERIES["typescript"]
+
+# Tree-sitter grammar per JavaScript/TypeScript file extension
+_JS_GRAMMARS = {".js": "javascript", ".ts": "typescript", ".tsx": "tsx"}
+
+# Files at least this large are decoded from a memory map instead of a read buffer
+_MMAP_MIN_SIZE = 1024 * 1024
+
+def _translate_newlines(text: str) -> str:
+    """Turn \r\n and \r line endings into \n, as reading in text mode does."""
+    if "\r" not in text:
+        return text
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
+def _read_file(path: Path) -> Tuple[str, int]:
+    """Read a UTF-8 file and its size with a single open, fstat and read."""
+    fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    try:
+        size = os.fstat(fd).st_size
+        if size >= _MMAP_MIN_SIZE:
+            # Decode straight from the page cache, without a full-size bytes copy next to the str
+            with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mapped, memoryview(mapped) as view:
+                return _translate_newlines(str(view, 'utf-8')), size
+        raw = os.read(fd, size)
+    finally:
+        os.close(fd)
+    return _translate_newlines(raw.decode('utf-8')), size
+
+@functools.lru_cache(maxsize=None)
+def _get_tree_sitter(language: str):
+    """Get the parser and compiled query for a language, built once per process."""
+    return get_parser(language), get_language(language).query(_TREE_SITTER_QUERIES[language])
+
+def _tree_sitter_captures(language: str, content: str) -> Dict[str, List[str]]:
+    """Parse content once and collect the text of every query capture, in source order."""
+    parser, query = _get_tree_sitter(language)
+    tree = parser.parse(content.encode("utf-8"))
+    
+    captures = {}
+    for node, name in query.captures(tree.root_node):
+        captures.setdefault(name, []).append(node.text.decode("utf-8"))
+    return captures
+
+# Derived analyses kept for unchanged files, most recently used last; file contents are not kept
+_ANALYSIS_CACHE_SIZE = 1024
+_analysis_cache = OrderedDict()
+_analysis_cache_lock = threading.Lock()
+
+def _analyze_content(full_path: str, content: str) -> Dict[str, Any]:
+    """Derive the line count and language-specific structure of a file's content."""
+    analysis = {"line_count": len(content.splitlines())}
+    
+    # Add language-specific analysis
+    if full_path.endswith('.py'):
+        analysis.update(CodeAnalysisTool._analyze_python_file(content))
+    elif full_path.endswith(('.js', '.ts', '.tsx')):
+        analysis.update(CodeAnalysisTool._analyze_js_file(content, _JS_GRAMMARS[Path(full_path).suffix]))
+    elif full_path.endswith('.java'):
+        analysis.update(CodeAnalysisTool._analyze_java_file(content))
+    
+    return analysis
+
+def _analyze_path(full_path: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    """Read and analyze a file, reusing the analysis while its mtime and size are unchanged."""
+    content, size_bytes = _read_file(Path(full_path))
+    
+    key = (full_path, mtime_ns, size)
+    with _analysis_cache_lock:
+        analysis = _analysis_cache.get(key)
+        if analysis is not None:
+            _analysis_cache.move_to_end(key)
+    if analysis is None:
+        analysis = _analyze_content(full_path, content)
+        with _analysis_cache_lock:
+            _analysis_cache[key] = analysis
+            while len(_analysis_cache) > _ANALYSIS_CACHE_SIZE:
+                _analysis_cache.popitem(last=False)
+    
+    # Basic file analysis
+    return {
+        "size_bytes": size_bytes,
+        "extension": Path(full_path).suffix,
+        "content": content,
+        **analysis
+    }
+
+# Operations that only read files or the index, safe to run in parallel
+_READ_ONLY_OPERATIONS = frozenset(["analyze_file", "search_code", "get_file"])
+
 class CodeAnalysisInput(BaseModel):
     operation: str = Field(..., description="Operation to perform: analyze_file, modify_file, search_code, or get_file")
     file_path: Optional[str] = Field(None, description="Path to the file relative to project root")
@@ -28,7 +177,12 @@ class CodeAnalysisTool(BaseTool):
     def __init__(self):
         super().__init__()
         self.project_path = REPO_LOCAL_PATH
-        self.vector_db = CodeVectorDB()
+        # Shared with the agents and other tools, so its caches are reused
+        self.vector_db = get_vector_db()
+    
+    def is_concurrency_safe_call(self, tool_input: Union[str, Dict[str, Any]]) -> bool:
+        """Check whether a call only reads, so it can run in parallel with others; modify_file calls can't."""
+        return isinstance(tool_input, dict) and tool_input.get("operation") in _READ_ONLY_OPERATIONS
     
     def _run(self, operation: str, file_path: Optional[str] = None, 
              query: Optional[str] = None, new_content: Optional[str] = None,
@@ -51,55 +205,71 @@ class CodeAnalysisTool(BaseTool):
             return {"error": "File path is required"}
         
         full_path = self.project_path / file_path
-        if not full_path.exists():
-            return {"error": f"File not found: {file_path}"}
         
         try:
-            content = full_path.read_text(encoding='utf-8')
-            
-            # Basic file analysis
-            file_info = {
+            # Unchanged files (same mtime and size) reuse their cached analysis instead of being parsed again
+            st = os.stat(full_path)
+            return {
                 "file_path": file_path,
-                "size_bytes": full_path.stat().st_size,
-                "extension": full_path.suffix,
-                "content": content,
-                "line_count": len(content.splitlines())
+                **_analyze_path(str(full_path), st.st_mtime_ns, st.st_size)
             }
-            
-            # Add language-specific analysis
-            if file_path.endswith('.py'):
-                file_info.update(self._analyze_python_file(content))
-            elif file_path.endswith('.js') or file_path.endswith('.ts'):
-                file_info.update(self._analyze_js_file(content))
-            elif file_path.endswith('.java'):
-                file_info.update(self._analyze_java_file(content))
-            
-            return file_info
+        except FileNotFoundError:
+            return {"error": f"File not found: {file_path}"}
         except Exception as e:
             logger.error(f"Error analyzing file {file_path}: {str(e)}")
             return {"error": f"Error analyzing file: {str(e)}"}
     
-    def _analyze_python_file(self, content: str) -> Dict[str, Any]:
+    @staticmethod
+    def _analyze_python_file(content: str) -> Dict[str, Any]:
         """Analyze Python file."""
-        import re
+        try:
+            tree = ast.parse(content)
+        except SyntaxError:
+            # Not valid for this interpreter (e.g. Python 2), fall back to pattern matching
+            return CodeAnalysisTool._analyze_python_file_regex(content)
+        
+        # Collect everything in a single walk of the tree
+        imports = set()
+        classes = []
+        functions = []
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                imports.update(alias.name.split('.')[0] for alias in node.names)
+            elif isinstance(node, ast.ImportFrom):
+                if node.module and not node.level:
+                    imports.add(node.module.split('.')[0])
+            elif isinstance(node, ast.ClassDef):
+                classes.append(node)
+            elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                functions.append(node)
+        
+        # ast.walk is breadth-first, so restore source order
+        by_position = lambda node: (node.lineno, node.col_offset)
         
+        return {
+            "language": "python",
+            "imports": list(imports),
+            "classes": [node.name for node in sorted(classes, key=by_position)],
+            "functions": [node.name for node in sorted(functions, key=by_position)]
+        }
+    
+    @staticmethod
+    def _analyze_python_file_regex(content: str) -> Dict[str, Any]:
+        """Analyze Python file with regular expressions."""
         # Find imports
-        import_pattern = r'^import\s+(\w+)|^from\s+(\w+(?:\.\w+)*)\s+import'
         imports = set()
         
-        for match in re.finditer(import_pattern, content, re.MULTILINE):
+        for match in _PY_IMPORT_RE.finditer(content):
             if match.group(1):
                 imports.add(match.group(1))
             elif match.group(2):
                 imports.add(match.group(2).split('.')[0])
         
         # Find class definitions
-        class_pattern = r'class\s+(\w+)'
-        classes = re.findall(class_pattern, content)
+        classes = _PY_CLASS_RE.findall(content)
         
         # Find function definitions
-        function_pattern = r'def\s+(\w+)'
-        functions = re.findall(function_pattern, content)
+        functions = _PY_FUNCTION_RE.findall(content)
         
         return {
             "language": "python",
@@ -108,21 +278,32 @@ class CodeAnalysisTool(BaseTool):
             "functions": functions
         }
     
-    def _analyze_js_file(self, content: str) -> Dict[str, Any]:
-        """Analyze JavaScript/TypeScript file."""
-        import re
+    @staticmethod
+    def _analyze_js_file(content: str, grammar: str = "javascript") -> Dict[str, Any]:
+        """Analyze JavaScript/TypeScript file, parsed with the javascript, typescript or tsx grammar."""
+        if get_parser is None:
+            return CodeAnalysisTool._analyze_js_file_regex(content)
         
+        captures = _tree_sitter_captures(grammar, content)
+        
+        return {
+            "language": "javascript/typescript",
+            "imports": [source[1:-1] for source in captures.get("imports", [])],
+            "classes": captures.get("classes", []),
+            "functions": captures.get("functions", [])
+        }
+    
+    @staticmethod
+    def _analyze_js_file_regex(content: str) -> Dict[str, Any]:
+        """Analyze JavaScript/TypeScript file with regular expressions."""
         # Find imports
-        import_pattern = r'(?:import|require)\s*\(?[\'"](.+?)[\'"]'
-        imports = re.findall(import_pattern, content)
+        imports = _JS_IMPORT_RE.findall(content)
         
         # Find class definitions
-        class_pattern = r'class\s+(\w+)'
-        classes = re.findall(class_pattern, content)
+        classes = _JS_CLASS_RE.findall(content)
         
         # Find function definitions
-        function_pattern = r'(?:function|const|let|var)\s+(\w+)\s*\('
-        functions = re.findall(function_pattern, content)
+        functions = _JS_FUNCTION_RE.findall(content)
         
         return {
             "language": "javascript/typescript",
@@ -131,21 +312,33 @@ class CodeAnalysisTool(BaseTool):
             "functions": functions
         }
     
-    def _analyze_java_file(self, content: str) -> Dict[str, Any]:
+    @staticmethod
+    def _analyze_java_file(content: str) -> Dict[str, Any]:
         """Analyze Java file."""
-        import re
+        if get_parser is None:
+            return CodeAnalysisTool._analyze_java_file_regex(content)
         
+        captures = _tree_sitter_captures("java", content)
+        
+        return {
+            "language": "java",
+            # Keep only what follows the import keyword, as the pattern-based analyzer did
+            "imports": [declaration[len("import"):].rstrip(";").strip() for declaration in captures.get("imports", [])],
+            "classes": captures.get("classes", []),
+            "methods": captures.get("methods", [])
+        }
+    
+    @staticmethod
+    def _analyze_java_file_regex(content: str) -> Dict[str, Any]:
+        """Analyze Java file with regular expressions."""
         # Find imports
-        import_pattern = r'import\s+(.+?);'
-        imports = re.findall(import_pattern, content)
+        imports = _JAVA_IMPORT_RE.findall(content)
         
         # Find class definitions
-        class_pattern = r'(?:public|private|protected)?\s*class\s+(\w+)'
-        classes = re.findall(class_pattern, content)
+        classes = _JAVA_CLASS_RE.findall(content)
         
         # Find method definitions
-        method_pattern = r'(?:public|private|protected)?\s*(?:static)?\s*\w+\s+(\w+)\s*\('
-        methods = re.findall(method_pattern, content)
+        methods = _JAVA_METHOD_RE.findall(content)
         
         return {
             "language": "java",
@@ -175,9 +368,19 @@ class CodeAnalysisTool(BaseTool):
             original_content = ""
             if full_path.exists():
                 original_content = full_path.read_text(encoding='utf-8')
-            
-            # Write new content
-            full_path.write_text(new_content, encoding='utf-8')
+
+            # Leave unchanged files untouched, so their mtime and any watchers are not disturbed
+            if original_content and original_content == new_content:
+                return {
+                    "success": True,
+                    "file_path": file_path,
+                    "message": "No changes",
+                    "is_new_file": False,
+                    "changed_lines": 0
+                }
+
+            # Write new content; readers see either the old file or the new one, never a partial write
+            write_text_atomic(full_path, new_content)
             
             return {
                 "success": True,
@@ -192,21 +395,31 @@ class CodeAnalysisTool(BaseTool):
     
     def _count_changed_lines(self, original: str, new: str) -> int:
         """Count the number of changed lines between original and new content."""
+        # Identical content needs no diff at all
+        if original == new:
+            return 0
+        
         original_lines = original.splitlines()
         new_lines = new.splitlines()
         
-        # Use difflib for a more sophisticated diff
-        import difflib
-        diff = difflib.unified_diff(original_lines, new_lines, n=0)
-        
-        # Count changed lines
-        changed_lines = 0
-        for line in diff:
-            if line.startswith('+') or line.startswith('-'):
-                if not line.startswith('+++') and not line.startswith('---'):
-                    changed_lines += 1
+        # Only the region between the unchanged head and tail needs diffing
+        shortest = min(len(original_lines), len(new_lines))
+        head = 0
+        while head < shortest and original_lines[head] == new_lines[head]:
+            head += 1
+        tail = 0
+        while tail < shortest - head and original_lines[-1 - tail] == new_lines[-1 - tail]:
+            tail += 1
+        original_lines = original_lines[head:len(original_lines) - tail]
+        new_lines = new_lines[head:len(new_lines) - tail]
         
-        return changed_lines
+        # Count removed and added lines straight from the diff opcodes, matched in C when cdifflib is installed
+        matcher = SequenceMatcher(None, original_lines, new_lines)
+        return sum(
+            (i2 - i1) + (j2 - j1)
+            for tag, i1, i2, j1, j2 in matcher.get_opcodes()
+            if tag != 'equal'
+        )
     
     def _search_code(self, query: str, n_results: int = 5) -> Dict[str, Any]:
         """Search codebase for relevant code."""
@@ -214,10 +427,6 @@ class CodeAnalysisTool(BaseTool):
             return {"error": "Query is required"}
         
         try:
-            # Ensure vector database is initialized
-            if not hasattr(self.vector_db, 'vector_store') or self.vector_db.vector_store is None:
-                self.vector_db.embed_project()
-            
             # Search for relevant code
             results = self.vector_db.query_codebase(query, n_results)
             
@@ -236,18 +445,18 @@ class CodeAnalysisTool(BaseTool):
             return {"error": "File path is required"}
         
         full_path = self.project_path / file_path
-        if not full_path.exists():
-            return {"error": f"File not found: {file_path}"}
         
         try:
-            content = full_path.read_text(encoding='utf-8')
+            content, size_bytes = _read_file(full_path)
             
             return {
                 "file_path": file_path,
                 "content": content,
-                "size_bytes": full_path.stat().st_size,
+                "size_bytes": size_bytes,
                 "extension": full_path.suffix
             }
+        except FileNotFoundError:
+            return {"error": f"File not found: {file_path}"}
         except Exception as e:
             logger.error(f"Error getting file {file_path}: {str(e)}")
             return {"error": f"Error getting file: {str(e)}"}
@@ -1,8 +1,14 @@
 import os
+import shlex
+import shutil
+import asyncio
 import logging
 import subprocess
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple, Iterator, Set, Union
 
 from langchain.tools import BaseTool
 from pydantic import BaseModel, Field
@@ -11,6 +17,114 @@ from config.settings import REPO_LOCAL_PATH
 
 logger = logging.getLogger(__name__)
 
+# Directories never searched for project files
+_IGNORED_DIRS = frozenset(['venv', '.git', '.vscode', '__pycache__', 'node_modules'])
+
+def _walk_project(project_path: Path) -> Iterator[Tuple[str, str]]:
+    """Yield (directory, file name) for project files, pruning ignored directories during the walk."""
+    for root, dirs, files in os.walk(project_path):
+        dirs[:] = [d for d in dirs if d not in _IGNORED_DIRS]
+        for name in files:
+            yield root, name
+
+# Python markers take precedence over every other project type
+_PYTHON_MARKERS = frozenset(["requirements.txt", "setup.py", "pyproject.toml"])
+
+def _match_project_type(names: Set[str]) -> Optional[str]:
+    """Map the file names found in a project to its type."""
+    # Check for Python project
+    if names & _PYTHON_MARKERS:
+        return "python"
+    
+    # Check for Node.js project
+    if "package.json" in names:
+        return "nodejs"
+    
+    # Check for Maven project
+    if "pom.xml" in names:
+        return "maven"
+    
+    # Check for Gradle project
+    if names & {"build.gradle", "build.gradle.kts"}:
+        return "gradle"
+    
+    # Check for .NET project
+    if any(name.endswith((".csproj", ".sln")) for name in names):
+        return "dotnet"
+    
+    return None
+
+def _compile_one(file_path: Path) -> Tuple[Path, Optional[str]]:
+    """Parse one file with the builtin compiler, returning its syntax error if any."""
+    try:
+        with open(file_path, "rb") as f:
+            source = f.read()
+        # No .pyc is written; only the parse matters
+        compile(source, str(file_path), "exec", dont_inherit=True)
+        return file_path, None
+    except SyntaxError as e:
+        return file_path, f"{e.msg} at line {e.lineno}"
+    except Exception as e:
+        return file_path, str(e)
+
+# Below this many files, process pool startup costs more than compiling in-process
+_SYNTAX_CHECK_POOL_MIN_FILES = 64
+
+# Only the tail of a command's output is kept, so verbose builds don't grow memory without bound
+_OUTPUT_CHUNK_SIZE = 64 * 1024
+
+# Marks output whose beginning was dropped
+_TRUNCATED_MARKER = "... (output truncated)\n"
+
+# UTF-8 continuation bytes, left over at the start of the tail when a character is cut in half
+_UTF8_CONTINUATION_BYTES = bytes(range(0x80, 0xc0))
+
+class _OutputTail:
+    """The last max_bytes of a stream's output, dropping the oldest chunks once over the limit."""
+    
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.chunks = deque()
+        self.size = 0
+        self.truncated = False
+    
+    def append(self, chunk: bytes) -> None:
+        """Add a chunk of output, evicting the oldest chunks not needed for the last max_bytes."""
+        self.chunks.append(chunk)
+        self.size += len(chunk)
+        while self.size - len(self.chunks[0]) >= self.max_bytes:
+            self.size -= len(self.chunks.popleft())
+            self.truncated = True
+    
+    def text(self) -> str:
+        """Decode the kept output, marking it when anything was dropped."""
+        data = b"".join(self.chunks)
+        if len(data) > self.max_bytes:
+            data = data[-self.max_bytes:].lstrip(_UTF8_CONTINUATION_BYTES)
+            self.truncated = True
+        text = data.decode(errors="replace")
+        return _TRUNCATED_MARKER + text if self.truncated else text
+
+def _pump_chunks(stream: Any, output: _OutputTail) -> None:
+    """Read a binary stream in chunks into a bounded buffer until it closes."""
+    # read1 returns whatever is available instead of waiting for a full chunk
+    for chunk in iter(lambda: stream.read1(_OUTPUT_CHUNK_SIZE), b""):
+        output.append(chunk)
+    stream.close()
+
+async def _apump_chunks(stream: asyncio.StreamReader, output: _OutputTail) -> None:
+    """Read a subprocess stream in chunks into a bounded buffer until it closes."""
+    # Chunked reads avoid StreamReader's per-line length limit on long lines
+    while True:
+        chunk = await stream.read(_OUTPUT_CHUNK_SIZE)
+        if not chunk:
+            return
+        output.append(chunk)
+
+def _resolve_argv(argv: List[str]) -> List[str]:
+    """Resolve the program of an argument list on PATH, so wrappers like npm.cmd run without a shell."""
+    return [shutil.which(argv[0]) or argv[0], *argv[1:]]
+
 class CompilationInput(BaseModel):
     operation: str = Field(..., description="Operation to perform: compile or test")
     test_files: Optional[List[str]] = Field(None, description="List of test files to run")
@@ -22,6 +136,8 @@ class CompilationTool(BaseTool):
     description = "Compiles the project and runs tests"
     args_schema = CompilationInput
     project_path = REPO_LOCAL_PATH
+    project_type: Optional[str] = None
+    max_output_bytes: int = 1024 * 1024
     
     
     def __init__(self):
@@ -38,34 +154,42 @@ class CompilationTool(BaseTool):
         else:
             return {"error": f"Unknown operation: {operation}"}
     
+    async def _arun(self, operation: str, test_files: Optional[List[str]] = None,
+                    test_command: Optional[str] = None, build_command: Optional[str] = None) -> Dict[str, Any]:
+        """Run compilation or test operations without blocking the event loop."""
+        if operation == "compile":
+            return await self._acompile_project(build_command)
+        elif operation == "test":
+            return await self._arun_tests(test_files, test_command)
+        else:
+            return {"error": f"Unknown operation: {operation}"}
+    
     def _compile_project(self, build_command: Optional[str] = None) -> Dict[str, Any]:
         """Compile the project."""
         try:
-            # Detect project type and run appropriate build command
-            if build_command:
-                # Use custom build command if provided
-                return self._run_command(build_command)
-            else:
-                # Auto-detect project type and use appropriate build command
-                project_type = self._detect_project_type()
-                
-                if project_type == "python":
-                    # For Python, check syntax
-                    return self._check_python_syntax()
-                elif project_type == "nodejs":
-                    # For Node.js, run npm build
-                    return self._run_command("npm run build")
-                elif project_type == "maven":
-                    # For Maven, run mvn compile
-                    return self._run_command("mvn compile")
-                elif project_type == "gradle":
-                    # For Gradle, run gradle build
-                    return self._run_command("./gradlew build -x test")
-                elif project_type == "dotnet":
-                    # For .NET, run dotnet build
-                    return self._run_command("dotnet build")
-                else:
-                    return {"error": f"Could not determine project type for compilation"}
+            # For Python, check syntax unless a custom build command is provided
+            if not build_command and self._detect_project_type() == "python":
+                return self._check_python_syntax()
+            
+            command = build_command or self._get_build_command()
+            if command is None:
+                return {"error": f"Could not determine project type for compilation"}
+            return self._run_command(command)
+        except Exception as e:
+            logger.error(f"Error compiling project: {str(e)}")
+            return {"error": f"Error compiling project: {str(e)}"}
+    
+    async def _acompile_project(self, build_command: Optional[str] = None) -> Dict[str, Any]:
+        """Compile the project without blocking the event loop."""
+        try:
+            # Detection and the syntax check touch the file system, so they run in a worker thread
+            if not build_command and await asyncio.to_thread(self._detect_project_type) == "python":
+                return await asyncio.to_thread(self._check_python_syntax)
+            
+            command = build_command or await asyncio.to_thread(self._get_build_command)
+            if command is None:
+                return {"error": f"Could not determine project type for compilation"}
+            return await self._arun_command(command)
         except Exception as e:
             logger.error(f"Error compiling project: {str(e)}")
             return {"error": f"Error compiling project: {str(e)}"}
@@ -75,115 +199,125 @@ class CompilationTool(BaseTool):
         """Run project tests."""
         try:
             # Use custom test command if provided
-            if test_command:
-                return self._run_command(test_command)
-            
-            # Auto-detect project type and use appropriate test command
-            project_type = self._detect_project_type()
-            
-            if project_type == "python":
-                # For Python, run pytest or unittest
-                if Path(self.project_path / "pytest.ini").exists() or list(self.project_path.glob("**/test_*.py")):
-                    if test_files:
-                        return self._run_command(f"pytest {' '.join(test_files)}")
-                    else:
-                        return self._run_command("pytest")
-                else:
-                    if test_files:
-                        return self._run_command(f"python -m unittest {' '.join(test_files)}")
-                    else:
-                        return self._run_command("python -m unittest discover")
-            
-            elif project_type == "nodejs":
-                # For Node.js, run npm test
-                return self._run_command("npm test")
-            
-            elif project_type == "maven":
-                # For Maven, run mvn test
-                if test_files:
-                    test_classes = " ".join([f"-Dtest={Path(f).stem}" for f in test_files])
-                    return self._run_command(f"mvn test {test_classes}")
-                else:
-                    return self._run_command("mvn test")
-            
-            elif project_type == "gradle":
-                # For Gradle, run gradle test
-                return self._run_command("./gradlew test")
-            
-            elif project_type == "dotnet":
-                # For .NET, run dotnet test
-                if test_files:
-                    return self._run_command(f"dotnet test {' '.join(test_files)}")
-                else:
-                    return self._run_command("dotnet test")
-            
-            else:
+            command = test_command or self._get_test_command(test_files)
+            if command is None:
                 return {"error": f"Could not determine project type for testing"}
+            return self._run_command(command)
         except Exception as e:
             logger.error(f"Error running tests: {str(e)}")
             return {"error": f"Error running tests: {str(e)}"}
     
-    def _detect_project_type(self) -> Optional[str]:
-        """Detect the type of project."""
-        # Check for Python project
-        if list(self.project_path.glob("**/requirements.txt")) or \
-           list(self.project_path.glob("**/setup.py")) or \
-           list(self.project_path.glob("**/pyproject.toml")):
-            return "python"
+    async def _arun_tests(self, test_files: Optional[List[str]] = None,
+                          test_command: Optional[str] = None) -> Dict[str, Any]:
+        """Run project tests without blocking the event loop."""
+        try:
+            # Use custom test command if provided
+            command = test_command or await asyncio.to_thread(self._get_test_command, test_files)
+            if command is None:
+                return {"error": f"Could not determine project type for testing"}
+            return await self._arun_command(command)
+        except Exception as e:
+            logger.error(f"Error running tests: {str(e)}")
+            return {"error": f"Error running tests: {str(e)}"}
+    
+    def _get_build_command(self) -> Optional[List[str]]:
+        """Get the build command for the detected project type as an argument list."""
+        project_type = self._detect_project_type()
+        
+        if project_type == "nodejs":
+            # For Node.js, run npm build
+            return ["npm", "run", "build"]
+        elif project_type == "maven":
+            # For Maven, run mvn compile
+            return ["mvn", "compile"]
+        elif project_type == "gradle":
+            # For Gradle, run gradle build
+            return ["./gradlew", "build", "-x", "test"]
+        elif project_type == "dotnet":
+            # For .NET, run dotnet build
+            return ["dotnet", "build"]
+        else:
+            return None
+    
+    def _get_test_command(self, test_files: Optional[List[str]] = None) -> Optional[List[str]]:
+        """Get the test command for the detected project type as an argument list."""
+        project_type = self._detect_project_type()
+        test_files = test_files or []
+        
+        if project_type == "python":
+            # For Python, run pytest or unittest
+            if Path(self.project_path / "pytest.ini").exists() or any(
+                name.startswith("test_") and name.endswith(".py") for _, name in _walk_project(self.project_path)
+            ):
+                return ["pytest", *test_files]
+            else:
+                if test_files:
+                    return ["python", "-m", "unittest", *test_files]
+                else:
+                    return ["python", "-m", "unittest", "discover"]
         
-        # Check for Node.js project
-        if list(self.project_path.glob("**/package.json")):
-            return "nodejs"
+        elif project_type == "nodejs":
+            # For Node.js, run npm test
+            return ["npm", "test"]
         
-        # Check for Maven project
-        if list(self.project_path.glob("**/pom.xml")):
-            return "maven"
+        elif project_type == "maven":
+            # For Maven, run mvn test
+            return ["mvn", "test", *[f"-Dtest={Path(f).stem}" for f in test_files]]
         
-        # Check for Gradle project
-        if list(self.project_path.glob("**/build.gradle")) or \
-           list(self.project_path.glob("**/build.gradle.kts")):
-            return "gradle"
+        elif project_type == "gradle":
+            # For Gradle, run gradle test
+            return ["./gradlew", "test"]
         
-        # Check for .NET project
-        if list(self.project_path.glob("**/*.csproj")) or \
-           list(self.project_path.glob("**/*.sln")):
-            return "dotnet"
+        elif project_type == "dotnet":
+            # For .NET, run dotnet test
+            return ["dotnet", "test", *test_files]
+        
+        else:
+            return None
+    
+    def _detect_project_type(self) -> Optional[str]:
+        """Detect the type of project."""
+        # The type doesn't change within a session; undetected projects are retried, as files may be added
+        if self.project_type is None:
+            # Markers at the project root usually decide it without walking the whole tree
+            try:
+                top_level_names = set(os.listdir(self.project_path))
+            except OSError:
+                top_level_names = set()
+            
+            self.project_type = _match_project_type(top_level_names)
+            if self.project_type is None:
+                names = set()
+                for _, name in _walk_project(self.project_path):
+                    names.add(name)
+                    # Nothing outranks a Python marker, so the rest of the tree needn't be listed
+                    if name in _PYTHON_MARKERS:
+                        break
+                self.project_type = _match_project_type(names)
         
-        return None
+        return self.project_type
     
     def _check_python_syntax(self) -> Dict[str, Any]:
         """Check Python syntax."""
-        python_files = []
-        for ext in [".py"]:
-            python_files.extend(list(self.project_path.glob(f"**/*{ext}")))
-        
-        # Filter out files in directories that should be ignored
-        ignored_dirs = ['venv', '.git', '.vscode', '__pycache__', 'node_modules']
+        # Ignored directories are pruned during the walk, so their contents are never listed
         python_files = [
-            f for f in python_files 
-            if not any(ignored_dir in str(f) for ignored_dir in ignored_dirs)
+            Path(root, name) for root, name in _walk_project(self.project_path)
+            if name.endswith(".py")
         ]
         
+        if len(python_files) < _SYNTAX_CHECK_POOL_MIN_FILES:
+            results = list(map(_compile_one, python_files))
+        else:
+            # Large projects are checked in worker processes, one interpreter per worker instead of per file
+            with ProcessPoolExecutor(max_workers=os.cpu_count() or 1) as executor:
+                results = list(executor.map(_compile_one, python_files, chunksize=16))
+        
         errors = []
-        for file_path in python_files:
-            try:
-                # Check syntax using py_compile
-                result = subprocess.run(
-                    ["python", "-m", "py_compile", str(file_path)],
-                    capture_output=True,
-                    text=True,
-                    check=False
-                )
-                
-                if result.returncode != 0:
-                    errors.append({
-                        "file": str(file_path.relative_to(self.project_path)),
-                        "error": result.stderr.strip()
-                    })
-            except Exception as e:
+        for file_path, error in results:
+            if error:
                 errors.append({
                     "file": str(file_path.relative_to(self.project_path)),
-                    "error": str(e)
+                    "error": error
                 })
         
         if errors:
@@ -198,42 +332,87 @@ class CompilationTool(BaseTool):
                 "message": f"All {len(python_files)} Python files passed syntax check"
             }
     
-    def _run_command(self, command: str) -> Dict[str, Any]:
-        """Run a shell command in the project directory."""
+    def _run_command(self, command: Union[str, List[str]]) -> Dict[str, Any]:
+        """Run a command in the project directory; strings go through the shell, argument lists do not."""
+        shell = isinstance(command, str)
+        command_line = command if shell else shlex.join(command)
         try:
-            logger.info(f"Running command: {command}")
+            logger.info(f"Running command: {command_line}")
             
-            # Run the command
-            process = subprocess.run(
-                command,
-                shell=True,
+            # Run the command, pumping both pipes into bounded buffers as output arrives
+            process = subprocess.Popen(
+                command if shell else _resolve_argv(command),
+                shell=shell,
                 cwd=self.project_path,
-                capture_output=True,
-                text=True,
-                check=False
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE
             )
+            stdout, stderr = _OutputTail(self.max_output_bytes), _OutputTail(self.max_output_bytes)
+            pumps = [
+                threading.Thread(target=_pump_chunks, args=(process.stdout, stdout), daemon=True),
+                threading.Thread(target=_pump_chunks, args=(process.stderr, stderr), daemon=True)
+            ]
+            for pump in pumps:
+                pump.start()
+            returncode = process.wait()
+            for pump in pumps:
+                pump.join()
+            
+            return self._command_result(command_line, returncode, stdout.text(), stderr.text())
+        except Exception as e:
+            logger.error(f"Error running command '{command_line}': {str(e)}")
+            return {
+                "success": False,
+                "command": command_line,
+                "error": str(e),
+                "message": f"Error executing command"
+            }
+    
+    async def _arun_command(self, command: Union[str, List[str]]) -> Dict[str, Any]:
+        """Run a command in the project directory without blocking the event loop."""
+        command_line = command if isinstance(command, str) else shlex.join(command)
+        try:
+            logger.info(f"Running command: {command_line}")
             
-            # Process the result
-            if process.returncode == 0:
-                return {
-                    "success": True,
-                    "command": command,
-                    "output": process.stdout,
-                    "message": f"Command executed successfully"
-                }
+            # Run the command; the loop keeps serving other tasks while it waits
+            pipes = {"cwd": self.project_path, "stdout": asyncio.subprocess.PIPE, "stderr": asyncio.subprocess.PIPE}
+            if isinstance(command, str):
+                process = await asyncio.create_subprocess_shell(command, **pipes)
             else:
-                return {
-                    "success": False,
-                    "command": command,
-                    "output": process.stdout,
-                    "error": process.stderr,
-                    "message": f"Command failed with exit code {process.returncode}"
-                }
+                process = await asyncio.create_subprocess_exec(*_resolve_argv(command), **pipes)
+            # Buffer the last max_output_bytes of each stream
+            stdout, stderr = _OutputTail(self.max_output_bytes), _OutputTail(self.max_output_bytes)
+            await asyncio.gather(
+                _apump_chunks(process.stdout, stdout),
+                _apump_chunks(process.stderr, stderr)
+            )
+            returncode = await process.wait()
+            
+            return self._command_result(command_line, returncode, stdout.text(), stderr.text())
         except Exception as e:
-            logger.error(f"Error running command '{command}': {str(e)}")
+            logger.error(f"Error running command '{command_line}': {str(e)}")
             return {
                 "success": False,
-                "command": command,
+                "command": command_line,
                 "error": str(e),
                 "message": f"Error executing command"
             }
+    
+    def _command_result(self, command: str, returncode: int, stdout: str, stderr: str) -> Dict[str, Any]:
+        """Build the tool result for a finished command."""
+        # Process the result
+        if returncode == 0:
+            return {
+                "success": True,
+                "command": command,
+                "output": stdout,
+                "message": f"Command executed successfully"
+            }
+        else:
+            return {
+                "success": False,
+                "command": command,
+                "output": stdout,
+                "error": stderr,
+                "message": f"Command failed with exit code {returncode}"
+            }
@@ -1,18 +1,176 @@
 import os
 import re
+import functools
+import itertools
 import json
 import logging
-import subprocess
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Tuple, Iterator, Iterable, Callable
 
 from langchain.tools import BaseTool
 from pydantic import BaseModel, Field
 
 from config.settings import REPO_LOCAL_PATH
+from tools._version_cache import get_latest
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
+# Dependency file names per project type, in detection precedence order; .csproj matches by suffix
+_DEPENDENCY_FILES = (
+    ("python", ("requirements.txt", "setup.py", "pyproject.toml")),
+    ("nodejs", ("package.json",)),
+    ("maven", ("pom.xml",)),
+    ("gradle", ("build.gradle", "build.gradle.kts")),
+    ("dotnet", (".csproj",)),
+)
+_DEPENDENCY_FILE_NAMES = frozenset(name for _, names in _DEPENDENCY_FILES for name in names)
+
+# Parser method per project type and dependency file name; add other parsers as needed
+_PARSERS = {
+    "python": {"requirements.txt": "_parse_requirements_txt"},
+    "nodejs": {"package.json": "_parse_package_json"},
+    "maven": {"pom.xml": "_parse_pom_xml"},
+}
+
+# Latest-version lookup and upgrade check methods per project type; add other checkers as needed
+_UPGRADE_CHECKERS = {
+    "python": ("_get_python_version", "_check_python_upgrade"),
+    "nodejs": ("_get_nodejs_version", "_check_nodejs_upgrade"),
+    "maven": ("_get_maven_version", "_check_maven_upgrade"),
+}
+
+def _is_dependency_file(name: str) -> bool:
+    """Check whether a file name is one of the dependency files."""
+    return name in _DEPENDENCY_FILE_NAMES or name.endswith(".csproj")
+
+def _match_project_type(entries: Iterable[os.DirEntry], project_type: Optional[str] = None) -> Tuple[Optional[str], List[Path]]:
+    """Pick the project type from dependency file entries, with all of its dependency files; project_type fixes the type."""
+    # Bucket dependency files by name
+    found = {}
+    for entry in entries:
+        name = ".csproj" if entry.name.endswith(".csproj") else entry.name
+        found.setdefault(name, []).append(entry.path)
+    
+    # Python, then Node.js, Maven, Gradle and .NET; only the matched type's paths become Path objects
+    for candidate_type, names in _DEPENDENCY_FILES:
+        if project_type is not None and candidate_type != project_type:
+            continue
+        dependency_files = [Path(path) for name in names for path in found.get(name, [])]
+        if dependency_files:
+            return candidate_type, dependency_files
+    
+    return None, []
+
+@functools.lru_cache(maxsize=4096)
+def _parse_version(version: str) -> Any:
+    """Parse a version string once, or return None if it is not a PEP 440 version."""
+    from packaging.version import Version, InvalidVersion
+    
+    try:
+        return Version(version)
+    except InvalidVersion:
+        return None
+
+def _is_newer(latest_version: str, current_version: str) -> bool:
+    """Check whether latest_version is newer than current_version, comparing strings if either does not parse."""
+    latest, current = _parse_version(latest_version), _parse_version(current_version)
+    if latest is None or current is None:
+        return latest_version != current_version
+    return latest > current
+
+# Upgrade checks and file parsing mostly wait on I/O, so up to this many run at once
+_MAX_WORKERS = 32
+
+@functools.lru_cache(maxsize=1)
+def _get_http_session() -> Any:
+    """Create the HTTP session shared by all lookups, so connections to the same host are reused."""
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+    
+    session = requests.Session()
+    session.headers["User-Agent"] = "langchain-auto-upgrade"
+    # One pooled connection per worker thread, retrying transient failures
+    adapter = HTTPAdapter(pool_connections=_MAX_WORKERS, pool_maxsize=_MAX_WORKERS,
+                          max_retries=Retry(total=3, backoff_factor=0.2))
+    session.mount("https://", adapter)
+    return session
+
+# Specifier operators that give a requirement's current version, pins before lower bounds; upper
+# bounds and exclusions say nothing about the version in use
+_CURRENT_VERSION_OPERATORS = ("==", "~=", ">=", ">")
+
+# A plain "name<op>release" requirement such as requests==2.31.0, the common case, matched without
+# the full requirement parser
+_SIMPLE_REQUIREMENT_RE = re.compile(r"([A-Za-z0-9](?:[A-Za-z0-9._-]*[A-Za-z0-9])?)\s*(==|~=|>=|>)\s*(\d+(?:\.\d+)*)")
+
+# For POMs small enough to match in memory: comments, which the XML parser skips; <dependency> blocks;
+# their <exclusions>, whose coordinates aren't the dependency's; and the coordinate fields
+_POM_COMMENT_RE = re.compile(r"<!--[\s\S]*?-->")
+_POM_DEPENDENCY_RE = re.compile(r"<dependency(?:\s[^>]*)?>([\s\S]*?)</dependency>")
+_POM_EXCLUSIONS_RE = re.compile(r"<exclusions>[\s\S]*?</exclusions>")
+_POM_FIELD_RE = re.compile(r"<(groupId|artifactId|version)>([^<]+)</\1>")
+# POMs at least this large are stream-parsed instead
+_POM_STREAM_MIN_SIZE = 64 * 1024
+
+def _pom_coordinates(fields: Iterable[Tuple[str, str]]) -> Optional[Tuple[str, str, str]]:
+    """Get (groupId, artifactId, version) from a dependency's (tag, text) fields, or None if one is missing."""
+    coordinates = {}
+    for tag, text in fields:
+        coordinates.setdefault(tag, text.strip())
+    if coordinates.get("groupId") and coordinates.get("artifactId") and coordinates.get("version"):
+        return coordinates["groupId"], coordinates["artifactId"], coordinates["version"]
+    return None
+
+def _match_pom_dependencies(content: str) -> Iterator[Tuple[str, str, str]]:
+    """Match (groupId, artifactId, version) out of a POM's text, as the XML parser would read them."""
+    from xml.sax.saxutils import unescape
+    
+    for block in _POM_DEPENDENCY_RE.finditer(_POM_COMMENT_RE.sub("", content)):
+        fields = _POM_FIELD_RE.findall(_POM_EXCLUSIONS_RE.sub("", block[1]))
+        coordinates = _pom_coordinates((tag, unescape(text)) for tag, text in fields)
+        if coordinates:
+            yield coordinates
+
+def _iter_pom_dependencies(file_path: Path) -> Iterator[Tuple[str, str, str]]:
+    """Stream (groupId, artifactId, version) out of a POM without holding the whole document."""
+    import xml.etree.ElementTree as ET
+    
+    for _, element in ET.iterparse(file_path, events=("end",)):
+        # Tags carry the POM namespace, e.g. {http://maven.apache.org/POM/4.0.0}dependency
+        if element.tag.rsplit("}", 1)[-1] != "dependency":
+            continue
+        coordinates = _pom_coordinates((child.tag.rsplit("}", 1)[-1], child.text or "") for child in element)
+        if coordinates:
+            yield coordinates
+        element.clear()
+
+# Directories never searched for dependency files
+_IGNORED_DIRS = frozenset([".git", "node_modules", ".venv", "venv", "__pycache__"])
+
+def _scan_project_files(root: Path) -> Iterator[os.DirEntry]:
+    """Yield the dependency files under root in a single os.scandir walk."""
+    stack = [root]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    # DirEntry caches the file type, so classifying an entry needs no extra stat
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in _IGNORED_DIRS:
+                            stack.append(entry.path)
+                    elif _is_dependency_file(entry.name):
+                        yield entry
+        except OSError as e:
+            logger.warning(f"Skipping unreadable directory: {str(e)}")
+
 class DependencyScannerInput(BaseModel):
     project_path: Path = Field(default=str(REPO_LOCAL_PATH), description="Path to the project directory")
 
@@ -20,6 +178,7 @@ class DependencyScanner(BaseTool):
     name: str = "dependency_scanner"
     description: str = "Scans a project for dependencies and identifies upgrade candidates"
     args_schema = DependencyScannerInput
+    is_concurrency_safe: bool = True
     
     def _run(self, project_path: Path = Path(REPO_LOCAL_PATH)) -> Dict[str, Any]:
         """Run the dependency scanner."""
@@ -51,95 +210,73 @@ class DependencyScanner(BaseTool):
     
     def _detect_project_type(self, project_path: Path) -> Tuple[Optional[str], List[Path]]:
         """Detect the type of project and find dependency files."""
-        dependency_files = []
-        
-        # Check for Python project
-        requirements_txt = list(project_path.glob("**/requirements.txt"))
-        setup_py = list(project_path.glob("**/setup.py"))
-        pyproject_toml = list(project_path.glob("**/pyproject.toml"))
-        
-        if requirements_txt or setup_py or pyproject_toml:
-            dependency_files.extend(requirements_txt)
-            dependency_files.extend(setup_py)
-            dependency_files.extend(pyproject_toml)
-            return "python", dependency_files
+        # One walk finds every dependency file, so nested ones in monorepos are parsed too
+        entries = list(_scan_project_files(project_path))
         
-        # Check for Node.js project
-        package_json = list(project_path.glob("**/package.json"))
-        if package_json:
-            dependency_files.extend(package_json)
-            return "nodejs", dependency_files
+        # Files at the root decide the type when there are any, e.g. a Python service with a nested package.json
+        root = str(project_path)
+        root_type, _ = _match_project_type(entry for entry in entries if os.path.dirname(entry.path) == root)
         
-        # Check for Java/Maven project
-        pom_xml = list(project_path.glob("**/pom.xml"))
-        if pom_xml:
-            dependency_files.extend(pom_xml)
-            return "maven", dependency_files
-        
-        # Check for Gradle project
-        build_gradle = list(project_path.glob("**/build.gradle")) + list(project_path.glob("**/build.gradle.kts"))
-        if build_gradle:
-            dependency_files.extend(build_gradle)
-            return "gradle", dependency_files
-        
-        # Check for .NET project
-        csproj_files = list(project_path.glob("**/*.csproj"))
-        if csproj_files:
-            dependency_files.extend(csproj_files)
-            return "dotnet", dependency_files
-        
-        return None, []
+        return _match_project_type(entries, root_type)
     
     def _parse_dependencies(self, project_type: str, dependency_files: List[Path]) -> List[Dict[str, str]]:
         """Parse dependencies based on project type."""
-        dependencies = []
+        if len(dependency_files) <= 1:
+            return [dep for file_path in dependency_files for dep in self._parse_dependency_file(project_type, file_path)]
         
-        for file_path in dependency_files:
-            if project_type == "python":
-                if file_path.name == "requirements.txt":
-                    dependencies.extend(self._parse_requirements_txt(file_path))
-                # Add other Python dependency file parsers as needed
-            
-            elif project_type == "nodejs":
-                if file_path.name == "package.json":
-                    dependencies.extend(self._parse_package_json(file_path))
-            
-            elif project_type == "maven":
-                if file_path.name == "pom.xml":
-                    dependencies.extend(self._parse_pom_xml(file_path))
-            
-            # Add other project type parsers as needed
-        
-        return dependencies
+        # Files are read and parsed independently, so overlap them; map keeps the file order
+        with ThreadPoolExecutor(max_workers=min(_MAX_WORKERS, len(dependency_files))) as executor:
+            results = executor.map(self._parse_dependency_file, itertools.repeat(project_type), dependency_files)
+            return list(itertools.chain.from_iterable(results))
+    
+    def _parse_dependency_file(self, project_type: str, file_path: Path) -> List[Dict[str, str]]:
+        """Parse the dependencies declared in one file."""
+        parser = _PARSERS.get(project_type, {}).get(file_path.name)
+        if parser is None:
+            return []
+        return getattr(self, parser)(file_path)
     
     def _parse_requirements_txt(self, file_path: Path) -> List[Dict[str, str]]:
         """Parse Python requirements.txt file."""
+        from packaging.requirements import Requirement, InvalidRequirement
+        
         dependencies = []
         try:
-            content = file_path.read_text()
-            for line in content.splitlines():
-                line = line.strip()
-                if not line or line.startswith('#'):
-                    continue
-                
-                # Handle different formats
-                if '==' in line:
-                    name, version = line.split('==', 1)
-                    dependencies.append({
-                        "name": name.strip(),
-                        "version": version.strip(),
-                        "constraint": "==",
-                        "file": str(file_path)
-                    })
-                elif '>=' in line:
-                    name, version = line.split('>=', 1)
+            # Read line by line rather than holding the whole file and a list of its lines
+            with file_path.open("r", encoding="utf-8") as f:
+                for line in f:
+                    # Drop comments, including trailing ones
+                    line = line.split(" #", 1)[0].strip()
+                    if not line or line.startswith('#'):
+                        continue
+                    
+                    simple = _SIMPLE_REQUIREMENT_RE.fullmatch(line)
+                    if simple:
+                        dependencies.append({
+                            "name": simple[1],
+                            "version": simple[3],
+                            "constraint": simple[2],
+                            "file": str(file_path)
+                        })
+                        continue
+                    
+                    # Options (-r, -e, --index-url) and other non-requirement lines are skipped
+                    try:
+                        requirement = Requirement(line)
+                    except InvalidRequirement:
+                        continue
+                    
+                    # One entry per requirement, e.g. "foo>=1.0,<2.0" is at version 1.0
+                    specifiers = {specifier.operator: specifier.version for specifier in requirement.specifier}
+                    operator = next((op for op in _CURRENT_VERSION_OPERATORS if op in specifiers), None)
+                    if operator is None:
+                        continue
                     dependencies.append({
-                        "name": name.strip(),
-                        "version": version.strip(),
-                        "constraint": ">=",
+                        "name": requirement.name,
+                        "version": specifiers[operator],
+                        "constraint": operator,
                         "file": str(file_path)
                     })
-                # Add other formats as needed
         except Exception as e:
             logger.error(f"Error parsing {file_path}: {str(e)}")
         
@@ -149,7 +286,8 @@ class DependencyScanner(BaseTool):
         """Parse Node.js package.json file."""
         dependencies = []
         try:
-            content = json.loads(file_path.read_text())
+            # Both parsers take the raw bytes, skipping the intermediate str
+            content = (orjson.loads if orjson is not None else json.loads)(file_path.read_bytes())
             
             # Parse dependencies
             for dep_type in ["dependencies", "devDependencies"]:
@@ -182,12 +320,11 @@ class DependencyScanner(BaseTool):
         """Parse Maven pom.xml file."""
         dependencies = []
         try:
-            # Simple regex-based parsing for demonstration
-            content = file_path.read_text()
-            
-            # Find dependencies
-            dep_pattern = r"<dependency>[\s\S]*?<groupId>(.*?)</groupId>[\s\S]*?<artifactId>(.*?)</artifactId>[\s\S]*?<version>(.*?)</version>[\s\S]*?</dependency>"
-            matches = re.findall(dep_pattern, content)
+            # Simple regex-based parsing for demonstration; large POMs are streamed through an XML parser
+            if file_path.stat().st_size >= _POM_STREAM_MIN_SIZE:
+                matches = _iter_pom_dependencies(file_path)
+            else:
+                matches = _match_pom_dependencies(file_path.read_text())
             
             for group_id, artifact_id, version in matches:
                 dependencies.append({
@@ -204,122 +341,142 @@ class DependencyScanner(BaseTool):
     
     def _find_upgrade_candidates(self, project_type: str, dependencies: List[Dict[str, str]]) -> List[Dict[str, Any]]:
         """Find upgrade candidates for the dependencies."""
-        upgrade_candidates = []
+        checkers = _UPGRADE_CHECKERS.get(project_type)
+        if checkers is None:
+            return []
+        get_latest_version, check_upgrade = (getattr(self, name) for name in checkers)
         
+        # The same package is often declared in several files or constraints; look each one up once
+        unique_dependencies = {}
         for dep in dependencies:
-            if project_type == "python":
-                candidates = self._check_python_upgrade(dep)
-                if candidates:
-                    upgrade_candidates.append(candidates)
-            
-            elif project_type == "nodejs":
-                candidates = self._check_nodejs_upgrade(dep)
-                if candidates:
-                    upgrade_candidates.append(candidates)
-            
-            elif project_type == "maven":
-                candidates = self._check_maven_upgrade(dep)
-                if candidates:
-                    upgrade_candidates.append(candidates)
-            
-            # Add other project type checkers as needed
+            unique_dependencies.setdefault(dep["name"], dep)
+        
+        if not unique_dependencies:
+            return []
+        
+        # Each lookup blocks on an HTTP request, so run them concurrently
+        with ThreadPoolExecutor(max_workers=min(_MAX_WORKERS, len(unique_dependencies))) as executor:
+            latest_versions = dict(zip(
+                unique_dependencies,
+                executor.map(self._lookup_latest_version, itertools.repeat(get_latest_version), unique_dependencies.values())
+            ))
+        
+        # Fan the results back out to every declaration, keeping input order
+        upgrade_candidates = []
+        for dep in dependencies:
+            candidate = check_upgrade(dep, latest_versions[dep["name"]])
+            if candidate:
+                upgrade_candidates.append(candidate)
         
         return upgrade_candidates
     
-    def _check_python_upgrade(self, dependency: Dict[str, str]) -> Optional[Dict[str, Any]]:
-        """Check for Python package upgrades using pip."""
+    def _lookup_latest_version(self, get_latest_version: Callable[[Dict[str, str]], Optional[str]],
+                               dependency: Dict[str, str]) -> Optional[str]:
+        """Look up the latest version of a dependency, logging failures instead of raising."""
         try:
-            package_name = dependency["name"]
-            current_version = dependency["version"]
-            
-            # Run pip to get latest version
-            result = subprocess.run(
-                ["pip", "index", "versions", package_name],
-                capture_output=True,
-                text=True,
-                check=False
-            )
-            
-            if result.returncode == 0:
-                # Parse the output to find the latest version
-                output = result.stdout
-                available_versions = re.findall(r"Available versions: (.*)", output)
-                
-                if available_versions:
-                    versions = available_versions[0].split(", ")
-                    latest_version = versions[0]  # First one is usually the latest
-                    
-                    if latest_version != current_version:
-                        return {
-                            "name": package_name,
-                            "current_version": current_version,
-                            "latest_version": latest_version,
-                            "file": dependency["file"]
-                        }
+            return get_latest_version(dependency)
         except Exception as e:
             logger.error(f"Error checking upgrade for {dependency['name']}: {str(e)}")
+            return None
+    
+    def _get_python_version(self, dependency: Dict[str, str]) -> Optional[str]:
+        """Get the latest version of a Python dependency, from the version cache or PyPI."""
+        package_name = dependency["name"]
+        return get_latest("python", package_name, lambda: self._fetch_python_version(package_name))
+    
+    def _check_python_upgrade(self, dependency: Dict[str, str], latest_version: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Check for Python package upgrades using PyPI."""
+        current_version = dependency["version"]
+        
+        if latest_version and _is_newer(latest_version, current_version):
+            return {
+                "name": dependency["name"],
+                "current_version": current_version,
+                "latest_version": latest_version,
+                "file": dependency["file"]
+            }
         
         return None
     
-    def _check_nodejs_upgrade(self, dependency: Dict[str, str]) -> Optional[Dict[str, Any]]:
-        """Check for Node.js package upgrades using npm."""
-        try:
-            package_name = dependency["name"]
-            current_version = dependency["version"]
-            
-            # Run npm to get latest version
-            result = subprocess.run(
-                ["npm", "view", package_name, "version"],
-                capture_output=True,
-                text=True,
-                check=False
-            )
-            
-            if result.returncode == 0:
-                latest_version = result.stdout.strip()
-                
-                if latest_version != current_version:
-                    return {
-                        "name": package_name,
-                        "current_version": current_version,
-                        "latest_version": latest_version,
-                        "type": dependency.get("type", "dependencies"),
-                        "file": dependency["file"]
-                    }
-        except Exception as e:
-            logger.error(f"Error checking upgrade for {dependency['name']}: {str(e)}")
+    def _fetch_python_version(self, package_name: str) -> Optional[str]:
+        """Get the latest version of a Python package from the PyPI JSON API."""
+        response = _get_http_session().get(f"https://pypi.org/pypi/{urllib.parse.quote(package_name)}/json", timeout=5)
+        # Unknown packages answer 404
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        return response.json()["info"]["version"]
+    
+    def _get_nodejs_version(self, dependency: Dict[str, str]) -> Optional[str]:
+        """Get the latest version of a Node.js dependency, from the version cache or the npm registry."""
+        package_name = dependency["name"]
+        return get_latest("nodejs", package_name, lambda: self._fetch_nodejs_version(package_name))
+    
+    def _check_nodejs_upgrade(self, dependency: Dict[str, str], latest_version: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Check for Node.js package upgrades using the npm registry."""
+        current_version = dependency["version"]
+        
+        if latest_version and _is_newer(latest_version, current_version):
+            return {
+                "name": dependency["name"],
+                "current_version": current_version,
+                "latest_version": latest_version,
+                "type": dependency.get("type", "dependencies"),
+                "file": dependency["file"]
+            }
         
         return None
     
-    def _check_maven_upgrade(self, dependency: Dict[str, str]) -> Optional[Dict[str, Any]]:
+    def _fetch_nodejs_version(self, package_name: str) -> Optional[str]:
+        """Get the latest version of a Node.js package from the npm registry."""
+        # Query the registry directly instead of starting npm per package; scoped names keep their "@" and "/"
+        response = _get_http_session().get(
+            f"https://registry.npmjs.org/{urllib.parse.quote(package_name, safe='@/')}",
+            # The abbreviated metadata still carries dist-tags, at a fraction of the full document's size
+            headers={"Accept": "application/vnd.npm.install-v1+json"},
+            timeout=5
+        )
+        # Unknown packages answer 404
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        return response.json().get("dist-tags", {}).get("latest")
+    
+    def _get_maven_version(self, dependency: Dict[str, str]) -> Optional[str]:
+        """Get the latest version of a Maven dependency, from the version cache or Maven Central."""
+        group_id = dependency["group_id"]
+        artifact_id = dependency["artifact_id"]
+        return get_latest(
+            "maven", f"{group_id}:{artifact_id}", lambda: self._fetch_maven_version(group_id, artifact_id)
+        )
+    
+    def _check_maven_upgrade(self, dependency: Dict[str, str], latest_version: Optional[str]) -> Optional[Dict[str, Any]]:
         """Check for Maven package upgrades using Maven API."""
-        try:
-            group_id = dependency["group_id"]
-            artifact_id = dependency["artifact_id"]
-            current_version = dependency["version"]
-            
-            # Use Maven Central API to get latest version
-            # This is a simplified example - in practice, you might want to use a proper Maven API client
-            import requests
-            url = f"https://search.maven.org/solrsearch/select?q=g:{group_id}+AND+a:{artifact_id}&rows=20&wt=json"
-            
-            response = requests.get(url)
-            if response.status_code == 200:
-                data = response.json()
-                if data["response"]["numFound"] > 0:
-                    docs = data["response"]["docs"]
-                    latest_version = docs[0]["latestVersion"]
-                    
-                    if latest_version != current_version:
-                        return {
-                            "name": f"{group_id}:{artifact_id}",
-                            "group_id": group_id,
-                            "artifact_id": artifact_id,
-                            "current_version": current_version,
-                            "latest_version": latest_version,
-                            "file": dependency["file"]
-                        }
-        except Exception as e:
-            logger.error(f"Error checking upgrade for {dependency['name']}: {str(e)}")
+        current_version = dependency["version"]
+        
+        if latest_version and _is_newer(latest_version, current_version):
+            return {
+                "name": dependency["name"],
+                "group_id": dependency["group_id"],
+                "artifact_id": dependency["artifact_id"],
+                "current_version": current_version,
+                "latest_version": latest_version,
+                "file": dependency["file"]
+            }
+        
+        return None
+    
+    def _fetch_maven_version(self, group_id: str, artifact_id: str) -> Optional[str]:
+        """Get the latest version of a Maven artifact from Maven Central."""
+        # Use Maven Central API to get latest version
+        # This is a simplified example - in practice, you might want to use a proper Maven API client
+        url = f"https://search.maven.org/solrsearch/select?q=g:{group_id}+AND+a:{artifact_id}&rows=20&wt=json"
+        
+        response = _get_http_session().get(url, timeout=5)
+        if response.status_code == 200:
+            data = response.json()
+            if data["response"]["numFound"] > 0:
+                docs = data["response"]["docs"]
+                return docs[0]["latestVersion"]
         
         return None
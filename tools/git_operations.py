@@ -1,9 +1,9 @@
 import os
 import logging
+import threading
 from pathlib import Path
 from typing import Dict, Any, Optional, List
 
-import git
 from langchain.tools import BaseTool
 from pydantic import BaseModel, Field
 
@@ -11,6 +11,33 @@ from config.settings import REPO_LOCAL_PATH, GITHUB_TOKEN, GITHUB_USERNAME, GITH
 
 logger = logging.getLogger(__name__)
 
+# Opened repositories by path, shared by every tool instance
+_repos: Dict[Path, Any] = {}
+_repos_lock = threading.Lock()
+
+def _open_repo(repo_path: Path) -> Optional[Any]:
+    """Open the Git repository at repo_path once per process, configuring the git user on first open."""
+    # GitPython pulls in gitdb and smmap, so it is only imported once a tool is created
+    import git
+    
+    with _repos_lock:
+        if repo_path in _repos:
+            return _repos[repo_path]
+        
+        try:
+            repo = git.Repo(repo_path)
+            # Configure git user
+            if GITHUB_USERNAME and GITHUB_EMAIL:
+                repo.git.config("user.name", GITHUB_USERNAME)
+                repo.git.config("user.email", GITHUB_EMAIL)
+        except git.exc.InvalidGitRepositoryError:
+            # Not cached, so a repository initialized later is picked up
+            logger.error(f"{repo_path} is not a valid Git repository")
+            return None
+        
+        _repos[repo_path] = repo
+        return repo
+
 class GitOperationInput(BaseModel):
     operation: str = Field(..., description="Git operation to perform: create_branch, commit, push, or create_pr")
     branch_name: Optional[str] = Field(None, description="Branch name for create_branch, push, or create_pr")
@@ -25,20 +52,12 @@ class GitOperationsTool(BaseTool):
     description = "Performs Git operations like creating branches, committing changes, pushing to remote, and creating pull requests"
     args_schema = GitOperationInput
     repo_path:  Path = None
-    repo: Optional[git.Repo] = None
+    repo: Any = None  # git.Repo, opened in __init__
     
     def __init__(self):
         super().__init__()
         self.repo_path = REPO_LOCAL_PATH
-        try:
-            self.repo = git.Repo(self.repo_path)
-            # Configure git user
-            if GITHUB_USERNAME and GITHUB_EMAIL:
-                self.repo.git.config("user.name", GITHUB_USERNAME)
-                self.repo.git.config("user.email", GITHUB_EMAIL)
-        except git.exc.InvalidGitRepositoryError:
-            logger.error(f"{self.repo_path} is not a valid Git repository")
-            self.repo = None
+        self.repo = _open_repo(self.repo_path)
     
     def _run(self, operation: str, branch_name: Optional[str] = None, 
              commit_message: Optional[str] = None, pr_title: Optional[str] = None, 
@@ -61,12 +80,14 @@ class GitOperationsTool(BaseTool):
     
     def _create_branch(self, branch_name: str) -> Dict[str, Any]:
         """Create a new Git branch."""
+        from git import GitCommandError
+        
         if not branch_name:
             return {"error": "Branch name is required"}
         
         try:
-            # Check if branch already exists
-            if branch_name in [ref.name.split('/')[-1] for ref in self.repo.refs]:
+            # Check if branch already exists, locally or on a remote (checkout then creates a tracking branch)
+            if branch_name in self.repo.heads or any(branch_name in remote.refs for remote in self.repo.remotes):
                 # Checkout existing branch
                 self.repo.git.checkout(branch_name)
                 return {"success": True, "message": f"Switched to existing branch: {branch_name}"}
@@ -74,40 +95,52 @@ class GitOperationsTool(BaseTool):
             # Create and checkout new branch
             self.repo.git.checkout('-b', branch_name)
             return {"success": True, "message": f"Created and switched to new branch: {branch_name}"}
-        except git.GitCommandError as e:
+        except GitCommandError as e:
             logger.error(f"Git error creating branch {branch_name}: {str(e)}")
             return {"success": False, "error": str(e)}
     
     def _commit_changes(self, commit_message: str, files: Optional[List[str]] = None) -> Dict[str, Any]:
         """Commit changes to Git repository."""
+        from git import GitCommandError
+        
         if not commit_message:
             return {"error": "Commit message is required"}
         
         try:
             # Add specific files or all changes
             if files:
+                existing_files = []
                 for file in files:
                     file_path = Path(self.repo_path) / file
                     if file_path.exists():
-                        self.repo.git.add(file)
+                        existing_files.append(file)
                     else:
                         logger.warning(f"File not found: {file}")
+                # One git add for all files instead of one process per file
+                if existing_files:
+                    self.repo.git.add('--', *existing_files)
             else:
                 self.repo.git.add('.')
             
-            # Check if there are changes to commit
-            if not self.repo.git.diff('--staged'):
+            # Check if there are changes to commit, comparing the index with HEAD in-process
+            if self.repo.head.is_valid():
+                has_staged_changes = bool(self.repo.index.diff("HEAD"))
+            else:
+                has_staged_changes = bool(self.repo.index.entries)
+            if not has_staged_changes:
                 return {"success": False, "message": "No changes to commit"}
             
             # Commit changes
             self.repo.git.commit('-m', commit_message)
             return {"success": True, "message": f"Changes committed with message: {commit_message}"}
-        except git.GitCommandError as e:
+        except GitCommandError as e:
             logger.error(f"Git error committing changes: {str(e)}")
             return {"success": False, "error": str(e)}
     
     def _push_changes(self, branch_name: Optional[str] = None) -> Dict[str, Any]:
         """Push changes to remote repository."""
+        from git import GitCommandError
+        
         try:
             if branch_name:
                 self.repo.git.push('--set-upstream', 'origin', branch_name)
@@ -116,7 +149,7 @@ class GitOperationsTool(BaseTool):
             
             current_branch = self.repo.active_branch.name
             return {"success": True, "message": f"Changes pushed to {current_branch}"}
-        except git.GitCommandError as e:
+        except GitCommandError as e:
             logger.error(f"Git error pushing changes: {str(e)}")
             return {"success": False, "error": str(e)}
     
@@ -1,20 +1,180 @@
 import os
+import asyncio
+import contextlib
+import fnmatch
+import functools
+import hashlib
+import json
 import logging
 import re
+import threading
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
 
+from langchain.globals import get_llm_cache
 from langchain.tools import BaseTool
 from pydantic import BaseModel, Field
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from config.settings import REPO_LOCAL_PATH, LLM_PROVIDER
-from tools.vector_db import CodeVectorDB
-from langchain_community.chat_models import ChatAnthropic
-from langchain_openai import ChatOpenAI
-from config.settings import ANTHROPIC_API_KEY, OPENAI_API_KEY, ANTHROPIC_MODEL, OPENAI_MODEL
+from tools.vector_db import CodeVectorDB, IGNORED_DIRS
+from tools._shared import get_llm, get_vector_db
+from config.settings import ANTHROPIC_MODEL, OPENAI_MODEL, TEST_GENERATION_CONCURRENCY
 
 logger = logging.getLogger(__name__)
 
+# Search for code similar to the file under test, and how many results to use as context
+_SIMILAR_CODE_QUERY = "code similar to {}"
+_SIMILAR_CODE_RESULTS = 3
+
+# Existing test files read at once
+_TEST_READ_WORKERS = 16
+
+# Framework-specific instructions appended to the test prompt
+_FRAMEWORK_HINTS = {
+    "pytest": """
+Please generate pytest tests for this file. Include:
+- Proper imports and fixtures
+- Test functions that start with 'test_'
+- Use of pytest assertions
+- Mocking where appropriate
+- Edge case testing
+- Parametrized tests where applicable
+""",
+    "unittest": """
+Please generate unittest tests for this file. Include:
+- A TestCase class that inherits from unittest.TestCase
+- Test methods that start with 'test_'
+- Proper use of setUp and tearDown methods if needed
+- Appropriate assertions
+- Edge case testing
+""",
+    "jest": """
+Please generate Jest tests for this file. Include:
+- Proper describe and it blocks
+- Use of expect assertions
+- Mocking where appropriate
+- Edge case testing
+- Before/after hooks if needed
+""",
+}
+
+# A fenced code block in an LLM response, capturing its body
+_CODE_BLOCK_RE = re.compile(r"```(?:\w+)?\n([\s\S]*?)\n```")
+
+# Top-level files that configure pytest, with the section that must appear in them (None: the file alone)
+_PYTEST_CONFIG_SECTIONS = {
+    "pytest.ini": None,
+    "conftest.py": None,
+    "pyproject.toml": "[tool.pytest.ini_options]",
+    "setup.cfg": "[tool:pytest]",
+    "tox.ini": "[pytest]",
+}
+
+# Separators between the words of an npm package name, e.g. @types/mocha or ts-jest
+_PACKAGE_NAME_SEPARATORS_RE = re.compile(r"[@/._-]")
+
+# Streamed responses stop at the first complete code block, so they are not full completions and stay
+# out of the shared LLM cache; the extracted tests are kept here instead, most recently used last
+_STREAMED_TESTS_CACHE_SIZE = 256
+_streamed_tests = OrderedDict()
+_streamed_tests_lock = threading.Lock()
+
+def _get_streamed_tests(cache_key: Optional[str]) -> Optional[str]:
+    """Tests extracted from an earlier streamed response to the same prompt, or None."""
+    if cache_key is None:
+        return None
+    with _streamed_tests_lock:
+        tests = _streamed_tests.get(cache_key)
+        if tests is not None:
+            _streamed_tests.move_to_end(cache_key)
+        return tests
+
+def _put_streamed_tests(cache_key: Optional[str], tests: str) -> None:
+    """Remember the tests extracted from a streamed response, evicting the least recently used."""
+    if cache_key is None:
+        return
+    with _streamed_tests_lock:
+        _streamed_tests[cache_key] = tests
+        _streamed_tests.move_to_end(cache_key)
+        while len(_streamed_tests) > _STREAMED_TESTS_CACHE_SIZE:
+            _streamed_tests.popitem(last=False)
+
+def _python_test_framework(project_path: Path) -> str:
+    """Pick pytest if the project configures it or has a conftest.py anywhere, otherwise unittest."""
+    # Top-level config answers most projects without walking the tree
+    for config_name, section in _PYTEST_CONFIG_SECTIONS.items():
+        config_path = project_path / config_name
+        try:
+            if section is None:
+                if config_path.is_file():
+                    return "pytest"
+            elif section in config_path.read_text(encoding="utf-8", errors="replace"):
+                return "pytest"
+        except OSError:
+            continue
+    # Nested pytest.ini or conftest.py files, skipping dependency and VCS directories; any() stops at the first
+    if any(_iter_files(project_path, _compile_patterns(("pytest.ini", "conftest.py")))):
+        return "pytest"
+    return "unittest"
+
+def _js_test_framework(project_path: Path) -> str:
+    """Pick the JS test framework from the dependencies in package.json, defaulting to Jest."""
+    package_json = project_path / "package.json"
+    try:
+        content = (orjson.loads if orjson is not None else json.loads)(package_json.read_bytes())
+    except (OSError, ValueError):
+        return "jest"
+    if not isinstance(content, dict):
+        return "jest"
+    
+    # Plugins count too, e.g. ts-jest or @types/mocha, but only as whole words of the name
+    dependencies = set()
+    for dep_type in ("dependencies", "devDependencies"):
+        declared = content.get(dep_type) or {}
+        if isinstance(declared, dict):
+            dependencies.update(declared)
+    words = {word for name in dependencies for word in _PACKAGE_NAME_SEPARATORS_RE.split(name)}
+    if "jest" in words:
+        return "jest"
+    elif "mocha" in words:
+        return "mocha"
+    return "jest"  # Default to Jest
+
+@functools.lru_cache(maxsize=256)
+def _compile_patterns(patterns: Tuple[str, ...]) -> re.Pattern:
+    """Combine file name glob patterns into one regex with a group per pattern."""
+    return re.compile("|".join(f"({fnmatch.translate(pattern)})" for pattern in patterns))
+
+def _iter_files(root: Path, name_re: re.Pattern) -> Iterator[Tuple[int, Path]]:
+    """Yield the files whose names match, with the matching group, skipping ignored directories."""
+    stack = [str(root)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in IGNORED_DIRS:
+                            stack.append(entry.path)
+                    else:
+                        match = name_re.match(entry.name)
+                        if match:
+                            # The group that matched is the pattern's position
+                            yield match.lastindex, Path(entry.path)
+        except OSError as e:
+            logger.warning(f"Skipping unreadable directory: {str(e)}")
+
+def _find_files(root: Path, patterns: Tuple[str, ...]) -> List[Path]:
+    """Find the files whose names match any of the glob patterns in one walk, ordered by pattern."""
+    matches = sorted(_iter_files(root, _compile_patterns(patterns)), key=lambda match: match[0])
+    return [path for _, path in matches]
+
 class TestGeneratorInput(BaseModel):
     file_path: str = Field(..., description="Path to the file to generate tests for")
     test_framework: Optional[str] = Field(None, description="Test framework to use (e.g., pytest, junit)")
@@ -31,86 +191,163 @@ class TestGeneratorTool(BaseTool):
     def __init__(self):
         super().__init__()
         self.project_path = REPO_LOCAL_PATH
-        self.vector_db = CodeVectorDB()
-          # Initialize LLM based on configuration
-        if LLM_PROVIDER.lower() == "anthropic":
-            self.llm = ChatAnthropic(
-                model=ANTHROPIC_MODEL,
-                anthropic_api_key=ANTHROPIC_API_KEY,
-                temperature=0.2
-            )
-        else:
-            # Remove proxies parameter as it's no longer supported in newer versions
-            self.llm = ChatOpenAI(
-                model=OPENAI_MODEL,
-                openai_api_key=OPENAI_API_KEY,
-                temperature=0.2
-            )
+        # Shared with the agents and other tools, so connection pools and caches stay warm
+        self.vector_db = get_vector_db()
+        # Initialize LLM based on configuration
+        model = ANTHROPIC_MODEL if LLM_PROVIDER.lower() == "anthropic" else OPENAI_MODEL
+        self.llm = get_llm(LLM_PROVIDER.lower(), model, 0.2)
     
     def _run(self, file_path: str, test_framework: Optional[str] = None,
              output_path: Optional[str] = None) -> Dict[str, Any]:
         """Generate test cases for a code file."""
-        if not file_path:
-            return {"error": "File path is required"}
-        
-        full_path = self.project_path / file_path
-        if not full_path.exists():
-            return {"error": f"File not found: {file_path}"}
+        error = self._check_file(file_path)
+        if error:
+            return error
         
         try:
-            # Read file content
-            file_content = full_path.read_text(encoding='utf-8')
-            
-            # Determine file type and appropriate test framework
-            file_type = full_path.suffix
-            if not test_framework:
-                test_framework = self._determine_test_framework(file_type)
-            
-            # Get similar code and existing tests for context
-            context = self._get_context(file_path, file_type)
+            test_framework, messages = self._prepare(file_path, test_framework)
             
             # Generate tests using LLM
-            tests = self._generate_tests(file_content, file_path, file_type, test_framework, context)
+            tests = self._generate_tests(messages)
             
             # Save tests if output path is provided
             if output_path:
                 self._save_tests(tests, output_path)
-                return {
-                    "success": True,
-                    "file_path": file_path,
-                    "test_framework": test_framework,
-                    "output_path": output_path,
-                    "tests": tests
-                }
-            else:
-                return {
-                    "success": True,
-                    "file_path": file_path,
-                    "test_framework": test_framework,
-                    "tests": tests
-                }
+            return self._result(file_path, test_framework, tests, output_path)
         except Exception as e:
             logger.error(f"Error generating tests for {file_path}: {str(e)}")
             return {"error": f"Error generating tests: {str(e)}"}
     
+    async def _arun(self, file_path: str, test_framework: Optional[str] = None,
+                    output_path: Optional[str] = None) -> Dict[str, Any]:
+        """Generate test cases for a code file without blocking the event loop."""
+        error = self._check_file(file_path)
+        if error:
+            return error
+        
+        try:
+            # File reads, globs and the vector search block, so they run in a worker thread
+            test_framework, messages = await asyncio.to_thread(self._prepare, file_path, test_framework)
+            
+            tests = await self._agenerate_tests(messages)
+            
+            if output_path:
+                await asyncio.to_thread(self._save_tests, tests, output_path)
+            return self._result(file_path, test_framework, tests, output_path)
+        except Exception as e:
+            logger.error(f"Error generating tests for {file_path}: {str(e)}")
+            return {"error": f"Error generating tests: {str(e)}"}
+    
+    def generate_for_files(self, file_paths: List[str], test_framework: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Generate tests for several files with one batched LLM call."""
+        results, pending = self._prepare_batch(file_paths, test_framework)
+        if pending:
+            # The chat model runs the batch concurrently; a failed request doesn't fail the others
+            responses = self.llm.batch(
+                [messages for _, _, _, messages in pending],
+                config={"max_concurrency": TEST_GENERATION_CONCURRENCY},
+                return_exceptions=True
+            )
+            self._fill_batch_results(results, pending, responses)
+        return results
+    
+    async def abatch_generate(self, file_paths: List[str], test_framework: Optional[str] = None,
+                              max_concurrency: int = TEST_GENERATION_CONCURRENCY) -> List[Dict[str, Any]]:
+        """Generate tests for several files with one batched LLM call, at most max_concurrency requests at a time."""
+        # File reads, globs and the vector searches block, so prompts are built in a worker thread
+        results, pending = await asyncio.to_thread(self._prepare_batch, file_paths, test_framework)
+        if pending:
+            responses = await self.llm.abatch(
+                [messages for _, _, _, messages in pending],
+                config={"max_concurrency": max_concurrency},
+                return_exceptions=True
+            )
+            self._fill_batch_results(results, pending, responses)
+        return results
+    
+    def _prepare_batch(self, file_paths: List[str],
+                       test_framework: Optional[str]) -> Tuple[List[Optional[Dict[str, Any]]], List[Tuple[int, str, str, List[Any]]]]:
+        """Build every prompt up front, recording per-file errors in place of results."""
+        results = [None] * len(file_paths)
+        pending = []
+        
+        self._prefetch_similar_code(file_paths)
+        
+        for index, file_path in enumerate(file_paths):
+            results[index] = self._check_file(file_path)
+            if results[index]:
+                continue
+            try:
+                framework, messages = self._prepare(file_path, test_framework)
+                pending.append((index, file_path, framework, messages))
+            except Exception as e:
+                logger.error(f"Error generating tests for {file_path}: {str(e)}")
+                results[index] = {"error": f"Error generating tests: {str(e)}"}
+        
+        return results, pending
+    
+    def _fill_batch_results(self, results: List[Optional[Dict[str, Any]]],
+                            pending: List[Tuple[int, str, str, List[Any]]], responses: List[Any]) -> None:
+        """Store the batched responses, or their errors, in place of the pending results."""
+        for (index, file_path, framework, _), response in zip(pending, responses):
+            if isinstance(response, Exception):
+                logger.error(f"Error generating tests for {file_path}: {str(response)}")
+                results[index] = {"error": f"Error generating tests: {str(response)}"}
+            else:
+                results[index] = self._result(file_path, framework, self._extract_tests(response.content), None)
+    
+    def _check_file(self, file_path: str) -> Optional[Dict[str, Any]]:
+        """Return an error result if the file to test is missing, else None."""
+        if not file_path:
+            return {"error": "File path is required"}
+        if not (self.project_path / file_path).exists():
+            return {"error": f"File not found: {file_path}"}
+        return None
+    
+    def _prepare(self, file_path: str, test_framework: Optional[str]) -> Tuple[str, List[Any]]:
+        """Read the file and gather its context, returning the test framework and the LLM messages."""
+        full_path = self.project_path / file_path
+        file_content = full_path.read_text(encoding='utf-8')
+        
+        # Determine file type and appropriate test framework
+        file_type = full_path.suffix
+        if not test_framework:
+            test_framework = self._determine_test_framework(file_type)
+        
+        # Get similar code and existing tests for context
+        context = self._get_context(file_path, file_type)
+        
+        return test_framework, self._build_messages(file_content, file_path, file_type, test_framework, context)
+    
+    def _result(self, file_path: str, test_framework: str, tests: str,
+                output_path: Optional[str]) -> Dict[str, Any]:
+        """Build the result returned for generated tests."""
+        result = {
+            "success": True,
+            "file_path": file_path,
+            "test_framework": test_framework,
+            "tests": tests
+        }
+        if output_path:
+            result["output_path"] = output_path
+        return result
+    
+    def _prefetch_similar_code(self, file_paths: List[str]) -> None:
+        """Search similar code for all files in one batch, so the per-file searches hit the query caches."""
+        try:
+            self.vector_db.batch_query_codebase(
+                [_SIMILAR_CODE_QUERY.format(file_path) for file_path in file_paths], _SIMILAR_CODE_RESULTS
+            )
+        except Exception as e:
+            # Each file then searches on its own
+            logger.warning(f"Could not prefetch similar code: {str(e)}")
+    
     def _determine_test_framework(self, file_type: str) -> str:
         """Determine appropriate test framework based on file type."""
         if file_type == '.py':
-            # Check if pytest is used in the project
-            if list(self.project_path.glob("**/pytest.ini")) or list(self.project_path.glob("**/conftest.py")):
-                return "pytest"
-            else:
-                return "unittest"
+            return _python_test_framework(self.project_path)
         elif file_type in ['.js', '.ts', '.jsx', '.tsx']:
-            # Check for Jest, Mocha, or other JS test frameworks
-            package_json = self.project_path / "package.json"
-            if package_json.exists():
-                content = package_json.read_text()
-                if "jest" in content:
-                    return "jest"
-                elif "mocha" in content:
-                    return "mocha"
-            return "jest"  # Default to Jest
+            return _js_test_framework(self.project_path)
         elif file_type == '.java':
             return "junit"
         elif file_type in ['.cs', '.vb']:
@@ -120,15 +357,11 @@ class TestGeneratorTool(BaseTool):
     
     def _get_context(self, file_path: str, file_type: str) -> Dict[str, Any]:
         """Get context for test generation, including similar code and existing tests."""
-        # Ensure vector database is initialized
-        if not hasattr(self.vector_db, 'vector_store') or self.vector_db.vector_store is None:
-            self.vector_db.embed_project()
-        
         # Get file name without extension
         file_name = Path(file_path).stem
         
         # Search for similar code
-        similar_code = self.vector_db.query_codebase(f"code similar to {file_path}", 3)
+        similar_code = self.vector_db.query_codebase(_SIMILAR_CODE_QUERY.format(file_path), _SIMILAR_CODE_RESULTS)
         
         # Search for existing tests
         test_file_patterns = {
@@ -142,32 +375,92 @@ class TestGeneratorTool(BaseTool):
         existing_tests = []
         patterns = test_file_patterns.get(file_type, [f"test_{file_name}.*", f"{file_name}_test.*"])
         
-        for pattern in patterns:
-            for test_file in self.project_path.glob(f"**/{pattern}"):
-                try:
-                    content = test_file.read_text(encoding='utf-8')
-                    existing_tests.append({
-                        "path": str(test_file.relative_to(self.project_path)),
-                        "content": content
-                    })
-                except Exception as e:
-                    logger.warning(f"Could not read test file {test_file}: {str(e)}")
+        # One walk for all patterns, then read the matches in parallel; map keeps the pattern order
+        test_files = _find_files(self.project_path, tuple(patterns))
+        if test_files:
+            with ThreadPoolExecutor(max_workers=min(_TEST_READ_WORKERS, len(test_files))) as executor:
+                for test_file, content in zip(test_files, executor.map(self._read_test_file, test_files)):
+                    if content is not None:
+                        existing_tests.append({
+                            "path": str(test_file.relative_to(self.project_path)),
+                            "content": content
+                        })
         
         return {
             "similar_code": similar_code,
             "existing_tests": existing_tests
         }
     
-    def _generate_tests(self, file_content: str, file_path: str, file_type: str,
-                        test_framework: str, context: Dict[str, Any]) -> str:
+    def _read_test_file(self, test_file: Path) -> Optional[str]:
+        """Read an existing test file, or None if it can't be read."""
+        try:
+            return test_file.read_text(encoding='utf-8')
+        except Exception as e:
+            logger.warning(f"Could not read test file {test_file}: {str(e)}")
+            return None
+    
+    def _generate_tests(self, messages: List[Any]) -> str:
         """Generate test cases using LLM."""
+        cache_key = self._streamed_cache_key(messages)
+        cached = _get_streamed_tests(cache_key)
+        if cached is not None:
+            return cached
+        
+        chunks = []
+        with contextlib.closing(self.llm.stream(messages)) as stream:
+            for chunk in stream:
+                chunks.append(chunk.content)
+                if self._has_complete_block(chunks, chunk.content):
+                    break
+        
+        tests = self._extract_tests("".join(chunks))
+        _put_streamed_tests(cache_key, tests)
+        return tests
+    
+    async def _agenerate_tests(self, messages: List[Any]) -> str:
+        """Generate test cases using LLM without blocking the event loop."""
+        cache_key = self._streamed_cache_key(messages)
+        cached = _get_streamed_tests(cache_key)
+        if cached is not None:
+            return cached
+        
+        chunks = []
+        # Async generators aren't closed when dropped, so close the stream explicitly on early exit
+        async with contextlib.aclosing(self.llm.astream(messages)) as stream:
+            async for chunk in stream:
+                chunks.append(chunk.content)
+                if self._has_complete_block(chunks, chunk.content):
+                    break
+        
+        tests = self._extract_tests("".join(chunks))
+        _put_streamed_tests(cache_key, tests)
+        return tests
+    
+    def _streamed_cache_key(self, messages: List[Any]) -> Optional[str]:
+        """Key of the streamed tests for these messages and model settings, or None when caching is off."""
+        if get_llm_cache() is None or self.llm.cache is False:
+            return None
+        key = json.dumps([self.llm.dict(), [(message.type, message.content) for message in messages]],
+                         sort_keys=True, default=str)
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+    
+    def _has_complete_block(self, chunks: List[str], latest: str) -> bool:
+        """Check whether the first code block has been fully streamed."""
+        # Only the first code block is used, so generation can stop as soon as its closing fence arrives.
+        # A fence needs a backtick, so other chunks skip the search
+        if "`" not in latest:
+            return False
+        return _CODE_BLOCK_RE.search("".join(chunks)) is not None
+    
+    def _build_messages(self, file_content: str, file_path: str, file_type: str,
+                        test_framework: str, context: Dict[str, Any]) -> List[Any]:
+        """Build the chat messages asking the LLM for tests."""
         # Create prompt for test generation
         prompt = self._create_test_prompt(file_content, file_path, file_type, test_framework, context)
         
-        # Generate tests using LLM
         from langchain.schema import HumanMessage, SystemMessage
         
-        messages = [
+        return [
             SystemMessage(content="""You are an expert test engineer who writes high-quality, comprehensive test cases.
             Generate test cases that cover all functionality, edge cases, and error conditions.
             Follow best practices for the specified test framework.
@@ -175,24 +468,23 @@ class TestGeneratorTool(BaseTool):
             """),
             HumanMessage(content=prompt)
         ]
+    
+    def _extract_tests(self, content: str) -> str:
+        """Extract the test code from an LLM response."""
+        # Only the first code block is used, so stop at it
+        match = _CODE_BLOCK_RE.search(content)
         
-        response = self.llm.invoke(messages)
-        
-        # Extract code blocks from response
-        import re
-        code_pattern = r"```(?:\w+)?\n([\s\S]*?)\n```"
-        code_matches = re.findall(code_pattern, response.content)
-        
-        if code_matches:
-            return code_matches[0]
+        if match:
+            return match.group(1)
         else:
             # If no code block found, return the whole response
-            return response.content
+            return content
     
     def _create_test_prompt(self, file_content: str, file_path: str, file_type: str,
                           test_framework: str, context: Dict[str, Any]) -> str:
         """Create prompt for test generation."""
-        prompt = f"""I need to generate tests for the following code file:
+        # Collect the pieces and join once, instead of copying the growing prompt on every +=
+        parts = [f"""I need to generate tests for the following code file:
 
 File path: {file_path}
 File type: {file_type}
@@ -204,53 +496,26 @@ Here is the content of the file:
 {file_content}
 ```
 
-"""
+"""]
         
         # Add context about existing tests if available
         if context["existing_tests"]:
-            prompt += "\nHere are some existing tests in the project that might be helpful:\n\n"
+            parts.append("\nHere are some existing tests in the project that might be helpful:\n\n")
             for test in context["existing_tests"][:2]:  # Limit to 2 test files to avoid token limits
-                prompt += f"Test file: {test['path']}\n```\n{test['content']}\n```\n\n"
+                parts.append(f"Test file: {test['path']}\n```\n{test['content']}\n```\n\n")
         
         # Add context about similar code if available
         if context["similar_code"]:
-            prompt += "\nHere are some similar code files in the project:\n\n"
+            parts.append("\nHere are some similar code files in the project:\n\n")
             for code in context["similar_code"][:2]:  # Limit to 2 similar files
-                prompt += f"File: {code['source']}\n```\n{code['content']}\n```\n\n"
+                parts.append(f"File: {code['source']}\n```\n{code['content']}\n```\n\n")
         
         # Add specific instructions based on test framework
-        if test_framework == "pytest":
-            prompt += """
-Please generate pytest tests for this file. Include:
-- Proper imports and fixtures
-- Test functions that start with 'test_'
-- Use of pytest assertions
-- Mocking where appropriate
-- Edge case testing
-- Parametrized tests where applicable
-"""
-        elif test_framework == "unittest":
-            prompt += """
-Please generate unittest tests for this file. Include:
-- A TestCase class that inherits from unittest.TestCase
-- Test methods that start with 'test_'
-- Proper use of setUp and tearDown methods if needed
-- Appropriate assertions
-- Edge case testing
-"""
-        elif test_framework == "jest":
-            prompt += """
-Please generate Jest tests for this file. Include:
-- Proper describe and it blocks
-- Use of expect assertions
-- Mocking where appropriate
-- Edge case testing
-- Before/after hooks if needed
-"""
+        parts.append(_FRAMEWORK_HINTS.get(test_framework, ""))
         
-        prompt += "\nPlease provide the complete test file that I can use directly without modifications."
+        parts.append("\nPlease provide the complete test file that I can use directly without modifications.")
         
-        return prompt
+        return "".join(parts)
     
     def _save_tests(self, tests: str, output_path: str) -> None:
         """Save generated tests to a file."""
@@ -1,91 +1,229 @@
 import os
+import stat
+import functools
+import hashlib
+import itertools
+import json
+import re
+import time
 import logging
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 import shutil
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
+import numpy as np
 from langchain_community.vectorstores import Chroma
 from langchain_openai import OpenAIEmbeddings
-from langchain_community.document_loaders import TextLoader
+from langchain.embeddings import CacheBackedEmbeddings
+from langchain.storage import LocalFileStore
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain.schema import Document
 
-from config.settings import VECTOR_DB_PATH, OPENAI_API_KEY, REPO_LOCAL_PATH
+from utils.file_utils import write_text_atomic
+from config.settings import VECTOR_DB_PATH, VECTOR_DB_MODE, VECTOR_DB_HOST, VECTOR_DB_PORT, OPENAI_API_KEY, REPO_LOCAL_PATH, EMBEDDING_CACHE_PATH, SEMANTIC_CACHE_DISTANCE
 
 logger = logging.getLogger(__name__)
 
+# Directories whose files are never embedded
+IGNORED_DIRS = frozenset(['node_modules', 'venv', '.git', '.idea', '.vscode', 'target', 'build', 'dist'])
+
+# Extensions of the files that are embedded
+_CODE_EXTENSIONS = frozenset([
+    '.py', '.java', '.js', '.ts', '.jsx', '.tsx', '.html', '.css', 
+    '.c', '.cpp', '.h', '.hpp', '.cs', '.go', '.rs', '.rb', '.php',
+    '.scala', '.kt', '.groovy', '.sh', '.bash', '.yml', '.yaml',
+    '.json', '.xml', '.md', '.txt', '.gradle', '.pom', '.properties'
+])
+
+# Directory listings mostly wait on the file system, so several run at once
+_WALK_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Files read at once while loading documents
+_LOAD_WORKERS = 32
+
+# Larger files are bundles or generated data rather than code worth embedding
+_MAX_FILE_BYTES = 256 * 1024
+
+# Leading bytes checked for a NUL to tell binary files apart from text
+_BINARY_SNIFF_BYTES = 512
+
+# Source -> content hash of every embedded file, written after each embedding run
+_MANIFEST_NAME = "manifest.json"
+
+# Searches run at once for a batch of queries
+_SEARCH_WORKERS = 8
+
+# Chunks per embeddings API request, and requests in flight at once
+_EMBEDDING_BATCH_SIZE = 1000
+_EMBEDDING_WORKERS = 4
+
+def _normalize_query(query: str) -> str:
+    """Collapse a query's whitespace; case is kept, as file paths in queries are case-sensitive."""
+    return " ".join(query.split())
+
+def _scan_directory(path: str) -> Tuple[List[Path], List[str]]:
+    """List one directory, returning its code files and the subdirectories to descend into."""
+    code_files, subdirectories = [], []
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                # DirEntry caches the file type, so classifying an entry needs no extra stat
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in IGNORED_DIRS:
+                        subdirectories.append(entry.path)
+                elif os.path.splitext(entry.name)[1] in _CODE_EXTENSIONS:
+                    code_files.append(Path(entry.path))
+    except OSError as e:
+        logger.warning(f"Skipping unreadable directory: {str(e)}")
+    return code_files, subdirectories
+
+# Recent searches are reused for the same query text. Reuse for a different query whose embedding is
+# at least this similar is opt-in (a SEMANTIC_CACHE_DISTANCE above 0)
+_QUERY_CACHE_SIMILARITY = 1.0 - SEMANTIC_CACHE_DISTANCE if SEMANTIC_CACHE_DISTANCE > 0 else None
+
+# File paths and names in a query, e.g. "code similar to src/app.py"; templated queries for different
+# paths embed almost identically, so such queries only ever reuse results for the same text
+_PATH_TOKEN_RE = re.compile(r"[/\\]|\b\w+\.\w{1,10}\b")
+_QUERY_CACHE_TTL_SECONDS = 600
+_QUERY_CACHE_SIZE = 1024
+
+# Query embeddings kept so repeated queries don't call the embeddings API again
+_QUERY_EMBEDDING_CACHE_SIZE = 2048
+
+@functools.lru_cache(maxsize=1)
+def _get_embeddings() -> CacheBackedEmbeddings:
+    """Get the shared embeddings client, so its HTTP connection pool is reused."""
+    # Chunk embeddings are stored on disk by content hash, so re-embedding only calls the API for new or
+    # changed chunks; the cache lives outside the vector DB directory, which force_refresh removes
+    embeddings = OpenAIEmbeddings(openai_api_key=OPENAI_API_KEY)
+    return CacheBackedEmbeddings.from_bytes_store(
+        embeddings, LocalFileStore(EMBEDDING_CACHE_PATH), namespace=embeddings.model
+    )
+
 class CodeVectorDB:
     def __init__(self):
         self.vector_db_path = VECTOR_DB_PATH
-        self.embeddings = OpenAIEmbeddings(openai_api_key=OPENAI_API_KEY)
+        self.embeddings = _get_embeddings()
         self.vector_store = None
+        # In server mode the index stays loaded in a long-running chroma server shared by every CLI run
+        self.client = None
+        if VECTOR_DB_MODE.lower() == "server":
+            import chromadb
+            self.client = chromadb.HttpClient(host=VECTOR_DB_HOST, port=VECTOR_DB_PORT)
+        # Tool instances are shared, so the lazy load below can be reached from several threads
+        self._lock = threading.RLock()
+        # Recent searches as (normalized query, n_results, results, timestamp), oldest first, with their
+        # unit-length query embeddings stacked row by row so all of them are compared in one matrix product
+        self._query_cache = []
+        self._query_cache_vectors = None
+        # SHA-256 of the query text -> embedding, least recently used first
+        self._query_embeddings = OrderedDict()
         
+    def _chroma_kwargs(self) -> Dict[str, Any]:
+        """Arguments that point Chroma at the server or the local persist directory."""
+        if self.client is not None:
+            return {"client": self.client}
+        return {"persist_directory": self.vector_db_path}
+
     def _get_code_files(self, project_path: Path) -> List[Path]:
         """Get all code files from project directory."""
-        code_extensions = [
-            '.py', '.java', '.js', '.ts', '.jsx', '.tsx', '.html', '.css', 
-            '.c', '.cpp', '.h', '.hpp', '.cs', '.go', '.rs', '.rb', '.php',
-            '.scala', '.kt', '.groovy', '.sh', '.bash', '.yml', '.yaml',
-            '.json', '.xml', '.md', '.txt', '.gradle', '.pom', '.properties'
-        ]
-        
+        # One walk of the tree, listing each level's directories in parallel
         code_files = []
-        for ext in code_extensions:
-            code_files.extend(list(project_path.glob(f"**/*{ext}")))
+        directories = [str(project_path)]
+        with ThreadPoolExecutor(max_workers=_WALK_WORKERS) as executor:
+            while directories:
+                subdirectories = []
+                for files, subdirs in executor.map(_scan_directory, directories):
+                    code_files.extend(files)
+                    subdirectories.extend(subdirs)
+                directories = subdirectories
         
-        # Filter out files in directories that should be ignored
-        ignored_dirs = ['node_modules', 'venv', '.git', '.idea', '.vscode', 'target', 'build', 'dist']
-        filtered_files = [
-            f for f in code_files 
-            if not any(ignored_dir in str(f) for ignored_dir in ignored_dirs)
-        ]
-        
-        return filtered_files
+        return code_files
     
     def _load_documents(self, file_paths: List[Path]) -> List[Document]:
         """Load documents from file paths."""
-        documents = []
+        # Reads mostly wait on the disk, so keep several in flight; map keeps the file order
+        with ThreadPoolExecutor(max_workers=_LOAD_WORKERS) as executor:
+            return [doc for file_docs in executor.map(self._load_file, file_paths) for doc in file_docs]
+    
+    def _load_file(self, file_path: Path) -> List[Document]:
+        """Load the document of one file, or none if it is too large, binary or can't be read."""
+        try:
+            # Only process regular files, checking the size before reading anything
+            file_stat = file_path.stat()
+            if not stat.S_ISREG(file_stat.st_mode):
+                return []
+            if file_stat.st_size > _MAX_FILE_BYTES:
+                logger.debug(f"Skipping {file_path}: {file_stat.st_size} bytes")
+                return []
+            
+            # Read once as bytes, then decode what passes the binary check
+            data = file_path.read_bytes()
+            if b"\x00" in data[:_BINARY_SNIFF_BYTES]:
+                logger.debug(f"Skipping binary file {file_path}")
+                return []
+            
+            return [Document(
+                page_content=data.decode("utf-8", errors="replace"),
+                metadata={
+                    "source": str(file_path.relative_to(REPO_LOCAL_PATH)),
+                    "file_type": file_path.suffix
+                }
+            )]
+        except Exception as e:
+            logger.warning(f"Could not load {file_path}: {str(e)}")
         
-        for file_path in file_paths:
-            try:
-                # Only process text files
-                if file_path.is_file():
-                    try:
-                        loader = TextLoader(str(file_path))
-                        file_docs = loader.load()
-                        
-                        # Add file path as metadata
-                        for doc in file_docs:
-                            doc.metadata["source"] = str(file_path.relative_to(REPO_LOCAL_PATH))
-                            doc.metadata["file_type"] = file_path.suffix
-                        
-                        documents.extend(file_docs)
-                    except Exception as e:
-                        logger.warning(f"Could not load {file_path}: {str(e)}")
-            except Exception as e:
-                logger.error(f"Error processing {file_path}: {str(e)}")
-        
-        return documents
+        return []
     
     def embed_project(self, project_path: Path = REPO_LOCAL_PATH, force_refresh: bool = False):
-        """Embed project code files into vector database."""
-        if os.path.exists(self.vector_db_path) and not force_refresh:
-            logger.info(f"Vector database already exists at {self.vector_db_path}. Loading...")
-            self.vector_store = Chroma(persist_directory=self.vector_db_path, embedding_function=self.embeddings)
-            return
-            
-        if os.path.exists(self.vector_db_path) and force_refresh:
+        """Embed project code files into vector database, re-embedding only files that changed since the last run."""
+        if self.client is not None:
+            if force_refresh:
+                logger.info(f"Removing existing collection from vector database server at {VECTOR_DB_HOST}:{VECTOR_DB_PORT}")
+                Chroma(embedding_function=self.embeddings, **self._chroma_kwargs()).delete_collection()
+            logger.info(f"Connecting to vector database server at {VECTOR_DB_HOST}:{VECTOR_DB_PORT}")
+        
+        elif os.path.exists(self.vector_db_path) and force_refresh:
             logger.info(f"Removing existing vector database at {self.vector_db_path}")
             shutil.rmtree(self.vector_db_path)
         
-        logger.info(f"Embedding project code from {project_path}")
+        else:
+            logger.info(f"Loading vector database at {self.vector_db_path}")
+        
+        self.vector_store = Chroma(embedding_function=self.embeddings, **self._chroma_kwargs())
+        manifest = {} if force_refresh else self._load_manifest()
+        
+        logger.info(f"Checking project code in {project_path} for changes")
         
         # Get all code files
         code_files = self._get_code_files(project_path)
         logger.info(f"Found {len(code_files)} code files")
         
+        # Compare content hashes with the last run
+        hashes = self._hash_files(code_files)
+        changed_files = [file_path for source, (file_path, digest) in hashes.items() if manifest.get(source) != digest]
+        removed_sources = [source for source in manifest if source not in hashes]
+        if not changed_files and not removed_sources:
+            logger.info("Vector database is up to date")
+            return
+        logger.info(f"{len(changed_files)} files changed and {len(removed_sources)} removed since the last run")
+        
+        # Results cached against the old index are no longer valid
+        with self._lock:
+            self._query_cache = []
+            self._query_cache_vectors = None
+        
+        # Drop the old chunks of changed and removed files; a store built without a manifest may hold any file
+        stale_sources = removed_sources + [source for source, (_, digest) in hashes.items() if manifest.get(source) != digest]
+        stale_ids = self.vector_store.get(where={"source": {"$in": stale_sources}}, include=[])["ids"]
+        if stale_ids:
+            self.vector_store.delete(ids=stale_ids)
+        
         # Load documents
-        documents = self._load_documents(code_files)
+        documents = self._load_documents(changed_files)
         logger.info(f"Loaded {len(documents)} documents")
         
         # Split documents
@@ -97,21 +235,114 @@ class CodeVectorDB:
         splits = text_splitter.split_documents(documents)
         logger.info(f"Split into {len(splits)} chunks")
         
-        # Create and persist vector store
-        self.vector_store = Chroma.from_documents(
-            documents=splits,
-            embedding=self.embeddings,
-            persist_directory=self.vector_db_path
-        )
-        self.vector_store.persist()
-        logger.info(f"Vector database created and persisted at {self.vector_db_path}")
+        self._embed_chunks([split.page_content for split in splits])
+        
+        # Add in slices so a large project stays under Chroma's batch size limit
+        for i in range(0, len(splits), _EMBEDDING_BATCH_SIZE):
+            self.vector_store.add_documents(splits[i:i + _EMBEDDING_BATCH_SIZE])
+        if self.client is None:
+            self.vector_store.persist()
+            logger.info(f"Vector database updated and persisted at {self.vector_db_path}")
+        else:
+            logger.info(f"Vector database updated on server at {VECTOR_DB_HOST}:{VECTOR_DB_PORT}")
+        
+        self._save_manifest({source: digest for source, (_, digest) in hashes.items()})
+    
+    def _hash_files(self, file_paths: List[Path]) -> Dict[str, Tuple[Path, str]]:
+        """Map each readable file's source name to its path and SHA-256 content hash."""
+        def hash_file(file_path: Path) -> Optional[Tuple[str, Path, str]]:
+            try:
+                source = str(file_path.relative_to(REPO_LOCAL_PATH))
+                return source, file_path, hashlib.sha256(file_path.read_bytes()).hexdigest()
+            except (OSError, ValueError) as e:
+                logger.warning(f"Could not hash {file_path}: {str(e)}")
+                return None
+        
+        # Reads mostly wait on the disk, so keep several in flight
+        with ThreadPoolExecutor(max_workers=_LOAD_WORKERS) as executor:
+            return {
+                source: (file_path, digest)
+                for source, file_path, digest in filter(None, executor.map(hash_file, file_paths))
+            }
+    
+    def _manifest_path(self) -> Path:
+        """Path of the manifest of embedded files, kept next to the local vector store."""
+        return Path(self.vector_db_path) / _MANIFEST_NAME
+    
+    def _load_manifest(self) -> Dict[str, str]:
+        """Load the source -> content hash map of the last embedding run, or an empty one."""
+        try:
+            return json.loads(self._manifest_path().read_bytes())
+        except (OSError, ValueError):
+            return {}
+    
+    def _save_manifest(self, manifest: Dict[str, str]) -> None:
+        """Write the manifest atomically, so an interrupted run can't leave it half-written."""
+        manifest_path = self._manifest_path()
+        manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        write_text_atomic(manifest_path, json.dumps(manifest))
+    
+    def _embed_chunks(self, texts: List[str]) -> None:
+        """Embed chunks in concurrent batches, filling the embedding cache that Chroma then reads from."""
+        # Identical chunks (licence headers, generated code) only need embedding once
+        unique_texts = list(dict.fromkeys(texts))
+        batches = [unique_texts[i:i + _EMBEDDING_BATCH_SIZE] for i in range(0, len(unique_texts), _EMBEDDING_BATCH_SIZE)]
+        if len(batches) <= 1:
+            return
+        
+        logger.info(f"Embedding {len(unique_texts)} unique chunks in {len(batches)} batches")
+        with ThreadPoolExecutor(max_workers=min(_EMBEDDING_WORKERS, len(batches))) as executor:
+            # Consume the results so a failed batch raises here
+            list(executor.map(self.embeddings.embed_documents, batches))
+    
+    def load_existing(self) -> bool:
+        """Open the index built by an earlier run without re-scanning the project; False if there is none."""
+        # The manifest is written once an index has been built; the server keeps its own collection
+        if self.client is None and not self._manifest_path().exists():
+            return False
+        self.vector_store = Chroma(embedding_function=self.embeddings, **self._chroma_kwargs())
+        return True
+    
+    def _ensure_vector_store(self) -> None:
+        """Open the vector store on first use, building it only if no index exists yet."""
+        with self._lock:
+            if not self.vector_store and not self.load_existing():
+                self.embed_project()
     
     def query_codebase(self, query: str, n_results: int = 5) -> List[Dict[str, Any]]:
         """Query the vector database for relevant code."""
-        if not self.vector_store:
-            self.embed_project()
+        self._ensure_vector_store()
+        
+        # Embed once; the vector serves both the cache lookup and the search
+        query_embedding, _ = self.embed_query_cached(query)
+        return self._search(query, query_embedding, n_results)
+    
+    def batch_query_codebase(self, queries: List[str], n_results: int = 5) -> List[List[Dict[str, Any]]]:
+        """Run several queries, embedding the new ones in a single API request."""
+        self._ensure_vector_store()
+        
+        embeddings = self._embed_queries(queries)
         
-        results = self.vector_store.similarity_search_with_score(query, k=n_results)
+        # Searches are independent local lookups, so overlap them; map keeps the query order
+        with ThreadPoolExecutor(max_workers=min(_SEARCH_WORKERS, max(len(queries), 1))) as executor:
+            return list(executor.map(self._search, queries, embeddings, itertools.repeat(n_results)))
+    
+    def _search(self, query: str, query_embedding: List[float], n_results: int) -> List[Dict[str, Any]]:
+        """Search for an embedded query, serving repeated recent searches from the query cache."""
+        query_vector = np.asarray(query_embedding, dtype=np.float32)
+        norm = np.linalg.norm(query_vector)
+        if norm > 0:
+            query_vector /= norm
+        
+        query_key = _normalize_query(query)
+        # Only path-free queries with a usable direction take part in similarity matching
+        semantic = _QUERY_CACHE_SIMILARITY is not None and norm > 0 and not _PATH_TOKEN_RE.search(query_key)
+        cached_results = self._lookup_query_cache(query_key, query_vector if semantic else None, n_results)
+        if cached_results is not None:
+            logger.info(f"Serving search for '{query}' from the query cache")
+            return cached_results
+        
+        results = self.vector_store.similarity_search_by_vector_with_relevance_scores(query_embedding, k=n_results)
         
         formatted_results = []
         for doc, score in results:
@@ -122,8 +353,108 @@ class CodeVectorDB:
                 "relevance_score": score
             })
         
+        with self._lock:
+            self._query_cache.append((query_key, n_results, formatted_results, time.monotonic(), semantic))
+            if self._query_cache_vectors is None:
+                self._query_cache_vectors = query_vector[np.newaxis, :]
+            else:
+                self._query_cache_vectors = np.vstack([self._query_cache_vectors, query_vector])
+            # Evict the oldest entries beyond the cache size
+            excess = len(self._query_cache) - _QUERY_CACHE_SIZE
+            if excess > 0:
+                del self._query_cache[:excess]
+                self._query_cache_vectors = self._query_cache_vectors[excess:]
+        
         return formatted_results
     
+    def _embed_queries(self, queries: List[str]) -> List[List[float]]:
+        """Embed queries, reusing cached embeddings and fetching the rest in one request."""
+        keys = [hashlib.sha256(query.encode("utf-8")).hexdigest() for query in queries]
+        with self._lock:
+            embeddings = [self._query_embeddings.get(key) for key in keys]
+            for key, embedding in zip(keys, embeddings):
+                if embedding is not None:
+                    self._query_embeddings.move_to_end(key)
+        
+        missing = {}
+        for index, (key, embedding) in enumerate(zip(keys, embeddings)):
+            if embedding is None:
+                missing.setdefault(key, []).append(index)
+        if not missing:
+            return embeddings
+        
+        # Query and document embeddings come from the same endpoint; the underlying model is used so
+        # queries stay out of the on-disk chunk cache
+        texts = [queries[indexes[0]] for indexes in missing.values()]
+        vectors = self.embeddings.underlying_embeddings.embed_documents(texts)
+        with self._lock:
+            for (key, indexes), vector in zip(missing.items(), vectors):
+                for index in indexes:
+                    embeddings[index] = vector
+                self._query_embeddings[key] = vector
+            while len(self._query_embeddings) > _QUERY_EMBEDDING_CACHE_SIZE:
+                self._query_embeddings.popitem(last=False)
+        return embeddings
+    
+    def embed_query_cached(self, query: str) -> Tuple[List[float], bool]:
+        """Embed a query, reusing earlier embeddings of the same text; also returns whether it was cached."""
+        key = hashlib.sha256(query.encode("utf-8")).hexdigest()
+        with self._lock:
+            embedding = self._query_embeddings.get(key)
+            if embedding is not None:
+                self._query_embeddings.move_to_end(key)
+                logger.debug(f"Query embedding cache hit for '{query}'")
+                return embedding, True
+        
+        # Call the API outside the lock so other searches aren't held up
+        embedding = self.embeddings.embed_query(query)
+        with self._lock:
+            self._query_embeddings[key] = embedding
+            if len(self._query_embeddings) > _QUERY_EMBEDDING_CACHE_SIZE:
+                self._query_embeddings.popitem(last=False)
+        return embedding, False
+    
+    def _lookup_query_cache(self, query_key: str, query_vector: Optional[np.ndarray],
+                            n_results: int) -> Optional[List[Dict[str, Any]]]:
+        """Return the results of a recent search for the same query, or failing that a near-identical one, if any.
+
+        Without a query vector only the same query text matches.
+        """
+        with self._lock:
+            # Drop expired entries; they are ordered by time
+            expired_before = time.monotonic() - _QUERY_CACHE_TTL_SECONDS
+            expired = 0
+            while expired < len(self._query_cache) and self._query_cache[expired][3] < expired_before:
+                expired += 1
+            if expired:
+                del self._query_cache[:expired]
+                self._query_cache_vectors = self._query_cache_vectors[expired:] if self._query_cache else None
+            
+            if not self._query_cache:
+                return None
+            
+            # Entries with fewer results than requested can't answer this search
+            usable = [cached_n_results >= n_results for _, cached_n_results, _, _, _ in self._query_cache]
+            
+            # The newest search for the same text wins
+            for index in range(len(self._query_cache) - 1, -1, -1):
+                if usable[index] and self._query_cache[index][0] == query_key:
+                    return list(self._query_cache[index][2][:n_results])
+            
+            if query_vector is None:
+                return None
+            
+            # Rows and the query are unit length, so the dot products are the cosine similarities; entries
+            # for queries with paths never match a different query
+            similarities = self._query_cache_vectors @ query_vector
+            similarities[[not (ok and entry[4]) for ok, entry in zip(usable, self._query_cache)]] = -1.0
+            best = int(np.argmax(similarities))
+            best_similarity, best_results = similarities[best], self._query_cache[best][2]
+        
+        if best_similarity >= _QUERY_CACHE_SIMILARITY:
+            return list(best_results[:n_results])
+        return None
+    
     def get_file_content(self, file_path: str) -> str:
         """Get the content of a specific file."""
         full_path = REPO_LOCAL_PATH / file_path
@@ -0,0 +1,31 @@
+import os
+import stat
+import tempfile
+from pathlib import Path
+
+# Permissions given to new files, read once since os.umask can only be queried by setting it
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+def write_text_atomic(path: Path, content: str) -> None:
+    """Write a UTF-8 file atomically and durably, via a unique temporary file renamed over the target."""
+    # A unique name per writer, in the same directory so the rename stays on one filesystem
+    f = tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=path.parent,
+                                    prefix=f".{path.name}.", suffix=".tmp", delete=False)
+    tmp_path = Path(f.name)
+    try:
+        with f:
+            f.write(content)
+            # The data must be on disk before the rename makes it visible
+            f.flush()
+            os.fsync(f.fileno())
+        # Keep the permissions of the file being replaced; temporary files are created private
+        try:
+            mode = stat.S_IMODE(os.stat(path).st_mode)
+        except FileNotFoundError:
+            mode = 0o666 & ~_UMASK
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
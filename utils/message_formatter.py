@@ -1,10 +1,41 @@
-from typing import Dict, Any, List
+import functools
+from typing import Dict, Any, List, Optional
 from enum import Enum
 import re
+import sys
+from rich.cells import cell_len
 from rich.console import Console
 from rich.panel import Panel
 from rich.text import Text
 
+# A fenced code block, capturing its language and body
+_CODE_BLOCK_RE = re.compile(r"```(\w*)\n([\s\S]*?)\n```")
+
+# Printable ASCII and newlines, which take one cell per character
+_PLAIN_TEXT_RE = re.compile(r"[\x20-\x7e\n]*")
+
+# Messages longer than this are not kept in the rendering cache
+_RENDER_CACHE_MAX_CONTENT = 8192
+
+def _plain_box(header: str, content: str, width: int) -> Optional[str]:
+    """Draw content in a rounded box like the rich panel, or return None if it needs rich's wrapping."""
+    lines = content.split("\n")
+    title = f" {header} "
+    # Two border columns and two spaces of padding on each side, as in the panel
+    text_width = max(map(len, lines))
+    if text_width > width - 6:
+        return None
+    inner_width = max(text_width + 4, cell_len(title) + 2)
+    
+    left = (inner_width - cell_len(title)) // 2
+    right = inner_width - cell_len(title) - left
+    blank = f"│{' ' * inner_width}│"
+    parts = [f"╭{'─' * left}{title}{'─' * right}╮", blank]
+    parts.extend(f"│  {line.ljust(inner_width - 4)}  │" for line in lines)
+    parts.append(blank)
+    parts.append(f"╰{'─' * inner_width}╯")
+    return "\n".join(parts) + "\n"
+
 class Role(str, Enum):
     SYSTEM = "system"
     USER = "user"
@@ -17,6 +48,16 @@ class MessageFormatter:
     @staticmethod
     def format_message(role: Role, content: str) -> str:
         """Format a message with a colored box based on the role."""
+        # The layout depends on the console's width and mode, which change on resize or redirect
+        console = MessageFormatter.console
+        # Long contents rarely repeat, so they are rendered without filling the cache
+        if len(content) > _RENDER_CACHE_MAX_CONTENT:
+            return MessageFormatter._render(role, content, console.width, console.is_terminal)
+        return MessageFormatter._render_cached(role, content, console.width, console.is_terminal)
+    
+    @staticmethod
+    def _render(role: Role, content: str, width: int, is_terminal: bool) -> str:
+        """Render a message as a colored box based on the role, for a console of this width and mode."""
         if role == Role.SYSTEM:
             color = "blue"
             emoji = "🤖"
@@ -27,7 +68,7 @@ class MessageFormatter:
             color = "purple"
             emoji = "🧠"
         elif role == Role.FUNCTION:
-            color = "orange"
+            color = "orange1"
             emoji = "⚙️"
         else:
             color = "gray"
@@ -35,9 +76,16 @@ class MessageFormatter:
             
         header = f"{emoji} {role.upper()}"
         
+        # Without a terminal nothing is styled, so plain text that needs no wrapping skips rich's layout and
+        # capture; control characters, wide characters and long lines still go through rich
+        if not is_terminal and _PLAIN_TEXT_RE.fullmatch(content):
+            box = _plain_box(header, content, width)
+            if box is not None:
+                return box
+        
         # Create a rich panel with proper styling
         panel = Panel(
-            content,
+            Text(content),
             title=header,
             border_style=color,
             expand=False,
@@ -49,7 +97,17 @@ class MessageFormatter:
             MessageFormatter.console.print(panel)
         
         return capture.get()
-    
+
+    # Repeated messages, such as the system prompt every turn, reuse their rendering
+    _render_cached = staticmethod(functools.lru_cache(maxsize=256)(_render.__func__))
+
+    @staticmethod
+    def print_message(role: Role, content: str) -> None:
+        """Format a message and write it to stdout in a single call."""
+        # One write and one flush per panel, instead of print's separate writes for text and newline
+        sys.stdout.write(MessageFormatter.format_message(role, content) + "\n")
+        sys.stdout.flush()
+
     @staticmethod
     def format_code_block(code: str, language: str = "") -> str:
         """Format code in a markdown code block."""
@@ -58,8 +116,7 @@ class MessageFormatter:
     @staticmethod
     def extract_code_blocks(text: str) -> List[Dict[str, str]]:
         """Extract code blocks from text."""
-        pattern = r"```(\w*)\n([\s\S]*?)\n```"
-        matches = re.findall(pattern, text)
+        matches = _CODE_BLOCK_RE.findall(text)
         
         code_blocks = []
         for language, code in matches: